@@ -0,0 +1,35 @@
+"""add partial unread notifications index
+
+Revision ID: 5e1c7d9a4b20
+Revises: 2453ae5e2053
+Create Date: 2026-10-16 10:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1c7d9a4b20'
+down_revision: Union[str, None] = '2453ae5e2053'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'notif_user_unread',
+        'notifications',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'message', 'read'],
+        postgresql_where=sa.text('read = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('notif_user_unread', table_name='notifications', postgresql_where=sa.text('read = false'))
@@ -0,0 +1,33 @@
+"""add dmca reports user asset index
+
+Revision ID: 8b3f2a6c1d74
+Revises: 5e1c7d9a4b20
+Create Date: 2026-10-16 14:37:05.926413
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3f2a6c1d74'
+down_revision: Union[str, None] = '5e1c7d9a4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'dmca_user_asset_created',
+        'dmca_reports',
+        ['user_id', 'original_asset_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('dmca_user_asset_created', table_name='dmca_reports')
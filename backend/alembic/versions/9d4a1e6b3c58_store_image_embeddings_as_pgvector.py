@@ -0,0 +1,45 @@
+"""store image embeddings as pgvector
+
+Revision ID: 9d4a1e6b3c58
+Revises: f2b8d4e6a915
+Create Date: 2026-10-16 18:21:09.402715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a1e6b3c58'
+down_revision: Union[str, None] = 'f2b8d4e6a915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    # #>> '{}' unwraps both JSON arrays and the json.dumps'd strings save_embedding wrote
+    op.alter_column(
+        'image_embeddings',
+        'vector',
+        existing_type=sa.JSON(),
+        type_=Vector(),
+        existing_nullable=False,
+        postgresql_using="(vector #>> '{}')::vector",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'image_embeddings',
+        'vector',
+        existing_type=Vector(),
+        type_=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using='to_json(vector::real[])',
+    )
@@ -0,0 +1,33 @@
+"""add dmca reports user created index
+
+Revision ID: c4e9d2b7a613
+Revises: 8b3f2a6c1d74
+Create Date: 2026-10-16 15:02:48.113507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9d2b7a613'
+down_revision: Union[str, None] = '8b3f2a6c1d74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'dmca_user_created',
+        'dmca_reports',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('dmca_user_created', table_name='dmca_reports')
@@ -0,0 +1,34 @@
+"""add dmca reports raw table
+
+Revision ID: e7a1c3f58d02
+Revises: c4e9d2b7a613
+Create Date: 2026-10-16 15:31:12.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c3f58d02'
+down_revision: Union[str, None] = 'c4e9d2b7a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dmca_reports_raw',
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['report_id'], ['dmca_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('report_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dmca_reports_raw')
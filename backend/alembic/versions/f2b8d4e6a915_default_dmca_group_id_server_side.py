@@ -0,0 +1,40 @@
+"""default dmca group id server side
+
+Revision ID: f2b8d4e6a915
+Revises: e7a1c3f58d02
+Create Date: 2026-10-16 16:04:37.581244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4e6a915'
+down_revision: Union[str, None] = 'e7a1c3f58d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'dmca_reports',
+        'infringement_group_id',
+        existing_type=sa.String(length=50),
+        existing_nullable=True,
+        server_default=sa.text('gen_random_uuid()::text'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'dmca_reports',
+        'infringement_group_id',
+        existing_type=sa.String(length=50),
+        existing_nullable=True,
+        server_default=None,
+    )
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     email_host: str = "smtp.gmail.com"
     email_port: int = 587
 
+    # ---------------------- DMCA Configuration ----------------------
+    DMCA_STORE_RAW_SERP: bool = False  # keep zstd-compressed SerpAPI payloads in dmca_reports_raw
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # allows other env vars not listed here
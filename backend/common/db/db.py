@@ -1,9 +1,26 @@
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from common.config.config import settings
+from common.utils.serialization import orjson_default
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _json_serializer(obj) -> str:
+    """orjson for JSON columns; drivers take text, so decode the bytes once here."""
+    return orjson.dumps(obj, default=orjson_default).decode()
+
+
+# JSON columns (page_tags, page_metadata, raw_serp_data, ...) encode and decode through orjson
+_json_options = dict(json_serializer=_json_serializer, json_deserializer=orjson.loads)
+
+engine = create_engine(settings.DATABASE_URL, **_json_options)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+# Same database through asyncpg, for handlers that should not hold a threadpool worker on I/O
+async_engine = create_async_engine(make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"), **_json_options)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -12,4 +29,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Iterable
+
+import orjson
+
+
+def orjson_default(obj):
+    """Shared orjson fallback for types it does not serialize natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+@lru_cache(maxsize=None)
+def row_encoder(model, fields: tuple = None) -> Callable[[object], bytes]:
+    """
+    Build (once per model/field set) a function that encodes an ORM object to JSON bytes.
+
+    Column names and the attribute getter are resolved up front, so encoding a row
+    is one C-level attrgetter call plus orjson.dumps.
+    """
+    keys = fields or tuple(column.key for column in model.__table__.columns)
+    get_values = attrgetter(*keys)
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda obj: orjson.dumps({key: get_values(obj)}, default=orjson_default)
+    return lambda obj: orjson.dumps(dict(zip(keys, get_values(obj))), default=orjson_default)
+
+
+def encode_rows(rows: Iterable, encoder: Callable[[object], bytes]) -> bytes:
+    """Encode rows into a JSON array without building an intermediate list of dicts"""
+    return b"[" + b",".join(map(encoder, rows)) + b"]"
@@ -14,8 +14,12 @@ from sqlalchemy import (
     Text,
     Boolean,
     JSON,
+    Index,
+    LargeBinary,
+    text,
 )
 from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
 from common.db.db import Base
 from datetime import datetime
 
@@ -56,7 +60,8 @@ class ImageEmbeddings(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image_id = Column(Integer, ForeignKey("images.id"), nullable=False)
-    vector = Column(JSON, nullable=False)
+    # No fixed width: ViT-B/32 (512) and ViT-L/14 (768) rows share this table
+    vector = Column(Vector(), nullable=False)
     model = Column(String(50), default="clip-vit")
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
@@ -135,6 +140,17 @@ class Notifications(Base):
     match = relationship("IpMatches", back_populates="notification")
     asset = relationship("IpAssets", back_populates="notifications")
 
+    __table_args__ = (
+        # Partial covering index for the unread feed: index-only scans over the working set
+        Index(
+            "notif_user_unread",
+            "user_id",
+            created_at.desc(),
+            postgresql_include=["id", "message", "read"],
+            postgresql_where=(read == False),  # noqa: E712
+        ),
+    )
+
 
 class DmcaReports(Base):
     """
@@ -151,7 +167,7 @@ class DmcaReports(Base):
     
     # ===== GROUPING FIELDS =====
     original_asset_id = Column(Integer, ForeignKey("ip_assets.id"), nullable=True)
-    infringement_group_id = Column(String(50), nullable=True)  # UUID for grouping multiple infringements
+    infringement_group_id = Column(String(50), nullable=True, server_default=text("gen_random_uuid()::text"))  # UUID for grouping multiple infringements
     
     # ===== TIER 1: CRITICAL FIELDS =====
     # URLs - The actual locations
@@ -193,7 +209,7 @@ class DmcaReports(Base):
     image_format = Column(String(20), nullable=True)             # ✅ jpg, png, webp, etc.
     
     # ===== TIER 3: RAW DATA & DEBUG =====
-    raw_serp_data = Column(JSON, nullable=True)                  # ✅ Complete SerpAPI response
+    raw_serp_data = Column(JSON, nullable=True)                  # Legacy rows only; new payloads go to dmca_reports_raw
     
     # ===== LEGACY FIELDS (Keep for compatibility) =====
     image_caption = Column(Text, nullable=True)
@@ -223,6 +239,24 @@ class DmcaReports(Base):
     original_asset = relationship("IpAssets", back_populates="dmca_reports")
     email_logs = relationship("EmailLog", back_populates="report", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Report list: a user's newest reports read straight off the index, no sort
+        Index("dmca_user_created", "user_id", created_at.desc()),
+        # Grouped report listing: rows come back already ordered by asset, newest first
+        Index("dmca_user_asset_created", "user_id", "original_asset_id", created_at.desc()),
+    )
+
+
+class DmcaReportRaw(Base):
+    """
+    Raw scraped payload for a DMCA report, kept out of the main row.
+    Stored as zstd-compressed orjson; only written when DMCA_STORE_RAW_SERP is enabled.
+    """
+    __tablename__ = "dmca_reports_raw"
+
+    report_id = Column(Integer, ForeignKey("dmca_reports.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)
+
 
 class EmailLog(Base):
     """
@@ -2,23 +2,26 @@
 import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Response
 from fastapi.responses import FileResponse
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import threading
 import traceback
 import uuid
 
 import logging
+from cachetools import TTLCache
 from pydantic import BaseModel
-from reportlab.pdfgen import canvas
 from datetime import datetime
+from itertools import islice
 
 from ip_service.services.ip_services import execute_ip_pipeline
 from ip_service.services.dmca_service import create_dmca_report
 from common.auth.auth import get_current_user
 from common.db.db import get_db
-from ip_service.models.ip_models import Images, IpMatches, DmcaReports, IpAssets
+from ip_service.models.ip_models import Images, IpMatches, DmcaReports, IpAssets, Notifications
 from ip_service.schemas.ip_schemas import MatchResponse
 from user_service.models.user_models import User
 from scrapping.uploader import generate_presigned_url
@@ -30,9 +33,15 @@ load_dotenv()
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 ip_router = APIRouter()
 
+_CONFIRM_MSG = "Match {id} confirmed. DMCA/report process started.".format
+
+# Rendered report PDFs keyed by report_content_key. The key changes whenever the report
+# does, so the TTL only bounds memory.
+_pdf_cache = TTLCache(maxsize=256, ttl=86400)
+_pdf_cache_lock = threading.Lock()
+
 # ===== REQUEST MODELS =====
 class ConfirmMatchRequest(BaseModel):
     user_confirmed: bool
@@ -319,84 +328,69 @@ def confirm_or_decline_match(
                 detail="Invalid action. Must be 'confirm' or 'decline'"
             )
         
-        # Get match and verify ownership
-        match = db.query(IpMatches).filter(IpMatches.id == match_id).first()
-        if not match:
-            raise HTTPException(status_code=404, detail="Match not found")
+        confirmed = request.action == 'confirm'
         
-        # Verify the match belongs to the current user
-        source_image = db.query(Images).filter(
-            Images.id == match.source_image_id,
-            Images.user_id == current_user.id
+        # Review the match in a single statement: only pending matches whose
+        # source image belongs to the current user are updated.
+        user_image_ids = select(Images.id).where(Images.user_id == current_user.id)
+        row = db.execute(
+            update(IpMatches)
+            .where(
+                IpMatches.id == match_id,
+                IpMatches.status == 'pending',
+                IpMatches.source_image_id.in_(user_image_ids)
+            )
+            .values(
+                status=request.action + 'ed',  # 'confirmed' or 'declined'
+                reviewed_at=datetime.utcnow(),
+                user_confirmed=confirmed
+            )
+            .returning(IpMatches.id, IpMatches.scraped_data)
+            .execution_options(synchronize_session=False)
         ).first()
         
-        if not source_image:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Check if already reviewed
-        try:
-            if hasattr(match, 'status') and match.status != 'pending':
-                return {
-                    "success": True,
-                    "message": f"Match already {match.status}",
-                    "status": match.status
-                }
-        except:
-            pass
-        
-        # Update match status
-        try:
-            match.status = request.action + 'ed'  # 'confirmed' or 'declined'
-            match.reviewed_at = datetime.utcnow()
-        except Exception as status_error:
-            logger.warning(f"⚠️ Status column might not exist yet: {status_error}")
-        
-        match.user_confirmed = (request.action == 'confirm')
+        if row is None:
+            # Nothing updated - work out whether the match is missing, not ours, or already reviewed
+            match = db.query(IpMatches).filter(IpMatches.id == match_id).first()
+            if not match:
+                raise HTTPException(status_code=404, detail="Match not found")
+            
+            source_image = db.query(Images.id).filter(
+                Images.id == match.source_image_id,
+                Images.user_id == current_user.id
+            ).first()
+            if not source_image:
+                raise HTTPException(status_code=403, detail="Access denied")
+            
+            return {
+                "success": True,
+                "message": f"Match already {match.status}",
+                "status": match.status
+            }
         
-        # If confirmed, generate DMCA report
-        if request.action == 'confirm':
+        # If confirmed, generate DMCA report and notify in the same transaction
+        if confirmed:
             try:
                 logger.info(f"🎯 Generating DMCA report for match {match_id}")
                 
-                # ✅ FIXED: Try multiple call patterns for create_dmca_report
-                try:
-                    # Pattern 1: (match_id, scraped_data, db, user_id)
-                    dmca_report = create_dmca_report(
-                        match_id=match.id,
-                        scraped_data=match.scraped_data or {},
-                        db=db,
-                        user_id=current_user.id
+                dmca_report = create_dmca_report(
+                    db=db,
+                    user_id=current_user.id,
+                    match_id=row.id,
+                    scraped_data=row.scraped_data or {},
+                    commit=False
+                )
+                db.execute(
+                    insert(Notifications).values(
+                        user_id=current_user.id,
+                        match_id=row.id,
+                        message=_CONFIRM_MSG(id=row.id)
                     )
-                except TypeError as e1:
-                    logger.warning(f"⚠️ Pattern 1 failed: {e1}")
-                    try:
-                        # Pattern 2: (match, db)
-                        dmca_report = create_dmca_report(match, db)
-                    except TypeError as e2:
-                        logger.warning(f"⚠️ Pattern 2 failed: {e2}")
-                        try:
-                            # Pattern 3: Full kwargs
-                            dmca_report = create_dmca_report(
-                                user_id=current_user.id,
-                                match_id=match.id,
-                                source_image_id=match.source_image_id,
-                                matched_asset_id=match.matched_asset_id,
-                                similarity_score=match.similarity_score,
-                                scraped_data=match.scraped_data or {},
-                                db=db
-                            )
-                        except TypeError as e3:
-                            logger.warning(f"⚠️ Pattern 3 failed: {e3}")
-                            # Pattern 4: Just required params
-                            dmca_report = create_dmca_report(
-                                match_id=match.id,
-                                scraped_data=match.scraped_data or {}
-                            )
+                )
+                db.commit()
                 
                 logger.info(f"✅ DMCA report {dmca_report.id} created for match {match_id}")
                 
-                db.commit()
-                
                 return {
                     "success": True,
                     "message": "Match confirmed and DMCA report generated",
@@ -410,7 +404,7 @@ def confirm_or_decline_match(
                 db.rollback()
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Match confirmed but DMCA generation failed: {str(dmca_error)}"
+                    detail=f"Match not confirmed: DMCA generation failed: {str(dmca_error)}"
                 )
         
         # If declined, just update status
@@ -673,19 +667,25 @@ async def send_dmca_report_email(
         }
         
         # ✅ FIX 4: Generate or get PDF path
-        pdf_path = f"/tmp/dmca_report_{report_id}.pdf"
-        
-        # Generate PDF if it doesn't exist
-        if not os.path.exists(pdf_path):
+        from ip_service.services.dmca_html_preview import report_content_key
+        # Keyed by content so an edited report never reuses a stale file
+        pdf_path = f"/tmp/dmca_report_{report_id}_{report_content_key(report)}.pdf"
+        
+        # Generate PDF if it doesn't exist. Both writers below move a finished file
+        # into place, so anything at pdf_path is complete; the size check also
+        # skips empty files left by older non-atomic writes.
+        if not (os.path.isfile(pdf_path) and os.path.getsize(pdf_path) > 0):
             try:
                 from ip_service.services.dmca_pdf_generator import generate_dmca_pdf
-                pdf_path = generate_dmca_pdf(report)
+                # Rendered to a temp file and renamed onto pdf_path, so later sends reuse it
+                pdf_path = generate_dmca_pdf(report, pdf_path)
                 logger.info(f"✅ Generated PDF using dmca_pdf_generator")
             except ImportError:
                 # Fallback: Basic PDF generation
                 logger.warning("⚠️ dmca_pdf_generator not found, using basic PDF generation")
                 from reportlab.pdfgen import canvas
-                c = canvas.Canvas(pdf_path)
+                tmp_path = f"{pdf_path}.{uuid.uuid4().hex}.tmp"
+                c = canvas.Canvas(tmp_path)
                 c.setFont("Helvetica-Bold", 16)
                 c.drawString(100, 750, f"DMCA Takedown Notice - Report #{report_id}")
                 c.setFont("Helvetica", 10)
@@ -693,6 +693,7 @@ async def send_dmca_report_email(
                 c.drawString(100, 700, f"Similarity: {report.similarity_score or 0:.2%}")
                 c.drawString(100, 680, f"Created: {report.created_at or 'N/A'}")
                 c.save()
+                os.replace(tmp_path, pdf_path)
                 logger.info(f"✅ Generated basic PDF")
         
         # ✅ FIX 5: Call send_dmca_email with CORRECT parameters
@@ -705,14 +706,16 @@ async def send_dmca_report_email(
             additional_message=request.additional_message
         )
         
+        # One timestamp for the report update and its email log entry
+        now = datetime.utcnow()
         if email_result.get("success"):
             # Update report with email info
             report.email_sent = True
             report.email_sent_to = request.recipient_email
-            report.email_sent_at = datetime.utcnow()
+            report.email_sent_at = now
             report.email_status = "sent"
             report.email_subject = f"DMCA Takedown Notice - Report #{report_id}"
-            report.updated_at = datetime.utcnow()
+            report.updated_at = now
             
             # Create email log entry
             email_log = EmailLog(
@@ -721,7 +724,7 @@ async def send_dmca_report_email(
                 recipient_email=request.recipient_email,
                 subject=f"DMCA Takedown Notice - Report #{report_id}",
                 status="sent",
-                sent_at=datetime.utcnow()
+                sent_at=now
             )
             db.add(email_log)
             
@@ -741,7 +744,7 @@ async def send_dmca_report_email(
             # Email failed - log the error
             report.email_status = "failed"
             report.email_error_message = email_result.get("error", "Unknown error")
-            report.updated_at = datetime.utcnow()
+            report.updated_at = now
             
             # Create failed email log
             email_log = EmailLog(
@@ -751,7 +754,7 @@ async def send_dmca_report_email(
                 subject=f"DMCA Takedown Notice - Report #{report_id}",
                 status="failed",
                 error_message=email_result.get("error"),
-                sent_at=datetime.utcnow()
+                sent_at=now
             )
             db.add(email_log)
             
@@ -792,15 +795,21 @@ def download_dmca_report(
 
         # Generate PDF using enhanced generator
         try:
-            from ip_service.services.dmca_pdf_generator import generate_dmca_pdf
-            
-            pdf_path = generate_dmca_pdf(report)
-            
-            logger.info(f"✅ Generated enhanced PDF for report {report_id}")
-            return FileResponse(
-                pdf_path, 
-                filename=f"dmca_report_{report_id}.pdf",
-                media_type="application/pdf"
+            from ip_service.services.dmca_pdf_generator import generate_dmca_pdf_bytes, report_content_key
+            
+            cache_key = report_content_key(report)
+            with _pdf_cache_lock:
+                pdf_bytes = _pdf_cache.get(cache_key)
+            
+            if pdf_bytes is None:
+                pdf_bytes = generate_dmca_pdf_bytes(report)
+                with _pdf_cache_lock:
+                    _pdf_cache[cache_key] = pdf_bytes
+                logger.info(f"✅ Generated enhanced PDF for report {report_id}")
+            return Response(
+                content=pdf_bytes,
+                media_type="application/pdf",
+                headers={"Content-Disposition": f'attachment; filename="dmca_report_{report_id}.pdf"'}
             )
             
         except ImportError:
@@ -808,6 +817,7 @@ def download_dmca_report(
             logger.warning("⚠️ Enhanced PDF generator not available, using basic generation")
             pdf_path = f"/tmp/dmca_report_{report_id}.pdf"
             
+            from reportlab.pdfgen import canvas
             c = canvas.Canvas(pdf_path)
             y = 750
             
@@ -887,10 +897,10 @@ def download_dmca_report(
                     y -= 15
                 if report.page_tags:
                     try:
-                        tags_str = ', '.join(report.page_tags[:5]) if isinstance(report.page_tags, list) else str(report.page_tags)
+                        tags_str = ', '.join(islice(report.page_tags, 5)) if isinstance(report.page_tags, list) else str(report.page_tags)
                         c.drawString(120, y, f"Tags: {tags_str[:80]}")
                         y -= 15
-                    except:
+                    except (TypeError, AttributeError):
                         pass
                 if report.best_guess:
                     c.drawString(120, y, f"Image Identified As: {report.best_guess}")
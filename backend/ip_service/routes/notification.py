@@ -1,21 +1,120 @@
 # ip_service/routes/notifications.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from common.db.db import get_db
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from common.db.db import AsyncSessionLocal, get_async_db
 from common.auth.auth import get_current_user
+from common.utils.serialization import row_encoder
 from ip_service.models.ip_models import Notifications
+from ip_service.services.ip_notification import get_notification_watermark_async, stream_user_notifications_async
 
 notification_router = APIRouter()
 
+# Serialized notification pages keyed by (user_id, unread_only, before, limit, watermark). The watermark
+# changes whenever a user's notifications do, so the TTL only bounds memory.
+_notifications_cache = TTLCache(maxsize=1024, ttl=60)
+_notifications_cache_lock = threading.Lock()
+
+_encode_notification = row_encoder(Notifications, ("id", "message", "read", "created_at"))
+
+
+def _make_etag(cache_key: tuple) -> str:
+    digest = hashlib.blake2b(repr(cache_key).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+# Cursors are "<created_at as UTC epoch microseconds>_<id>": digits and "_" only, so
+# they survive being pasted into ?before= without URL-encoding (an ISO offset's "+" would not)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _encode_cursor(notification) -> str:
+    created_at = notification.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return f"{(created_at - _EPOCH) // _MICROSECOND}_{notification.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    micros, _, notification_id = cursor.partition("_")
+    try:
+        return _EPOCH + int(micros) * _MICROSECOND, int(notification_id)
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _stream_notifications_page(user_id: int, unread_only: bool, before_key, limit: int, cache_key: tuple):
+    """Yield a notifications page as JSON chunks and cache the full body once it completes."""
+    chunks = [b'{"items":[']
+    yield chunks[0]
+    next_cursor = None
+    # The request-scoped session is closed before a streamed body is sent, so use our own
+    async with AsyncSessionLocal() as db:
+        count = 0
+        last = None
+        # Fetch one extra row to learn whether another page exists
+        async for n in stream_user_notifications_async(
+            db, user_id, unread_only=unread_only, before=before_key, limit=limit + 1
+        ):
+            if count == limit:
+                next_cursor = _encode_cursor(last)
+                break
+            chunk = (b"," if count else b"") + _encode_notification(n)
+            chunks.append(chunk)
+            yield chunk
+            last = n
+            count += 1
+
+    chunk = b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+    chunks.append(chunk)
+    yield chunk
+    with _notifications_cache_lock:
+        _notifications_cache[cache_key] = b"".join(chunks)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
 @notification_router.get("/", summary="List all user notifications")
-def list_notifications(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    """Retrieve all notifications for the logged-in user."""
-    notifications = db.query(Notifications).filter(Notifications.user_id == current_user.id).all()
-    return [
-        {
-            "id": n.id,
-            "message": n.message,
-            "read": n.read,
-            "created_at": n.created_at
-        } for n in notifications
-    ]
\ No newline at end of file
+async def list_notifications(
+    request: Request,
+    unread_only: bool = False,
+    before: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retrieve a page of notifications for the logged-in user, newest first.
+
+    Pass the returned next_cursor as `before` to fetch the following page.
+    """
+    before_key = _decode_cursor(before) if before else None
+    watermark = await get_notification_watermark_async(db, current_user.id)
+    cache_key = (current_user.id, unread_only, before, limit, watermark)
+    etag = _make_etag(cache_key)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    with _notifications_cache_lock:
+        body = _notifications_cache.get(cache_key)
+
+    if body is None:
+        return StreamingResponse(
+            _stream_notifications_page(current_user.id, unread_only, before_key, limit, cache_key),
+            media_type="application/json",
+            headers={"ETag": etag}
+        )
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -2,6 +2,8 @@ import logging
 import os
 import uuid
 import json
+from pathlib import Path
+import orjson
 from dataclasses import dataclass
 from typing import Any, Optional, Dict, List
 from sqlalchemy.orm import Session
@@ -16,10 +18,18 @@ from ip_service.models.ip_models import (
 )
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 _EMB_DIR = os.path.join(os.getcwd(), "embeddings")
-os.makedirs(_EMB_DIR, exist_ok=True)
+_emb_dir_ready = False
+
+
+def _ensure_emb_dir() -> None:
+    """Create the local embedding fallback directory on first use."""
+    global _emb_dir_ready
+    if not _emb_dir_ready:
+        Path(_EMB_DIR).mkdir(parents=True, exist_ok=True)
+        _emb_dir_ready = True
+
 
 @dataclass
 class TransientImageEntry:
@@ -76,14 +86,9 @@ def save_embedding(db: Session, image: Any, vector: List, model_name: str = "cli
     if not image_id:
         logger.warning("⚠️ No valid image_id provided, skipping embedding save")
         return None
-    try:
-        vector_json = json.dumps(vector)
-    except (TypeError, ValueError) as e:
-        logger.error("❌ Failed to serialize vector: %s", e)
-        return None
     db_emb = ImageEmbeddings(
         image_id=image_id,
-        vector=vector_json,
+        vector=vector,  # pgvector column: lists and numpy arrays bind directly
         model=model_name,
         created_at=datetime.utcnow()
     )
@@ -97,9 +102,15 @@ def save_embedding(db: Session, image: Any, vector: List, model_name: str = "cli
         db.rollback()
         logger.exception("❌ Failed to save embedding: %s", e)
         try:
-            emb_path = os.path.join(_EMB_DIR, f"{image_id}_{model_name}.json")
-            with open(emb_path, "w") as f:
-                json.dump({"image_id": image_id, "vector": vector, "model": model_name}, f)
+            _ensure_emb_dir()
+            # One append-only NDJSON file per model; replay streams it line by line.
+            emb_path = os.path.join(_EMB_DIR, f"{model_name}.ndjson")
+            line = orjson.dumps(
+                {"image_id": image_id, "vector": vector, "model": model_name},
+                option=orjson.OPT_SERIALIZE_NUMPY,
+            )
+            with open(emb_path, "ab") as f:
+                f.write(line + b"\n")
             logger.info("✅ Saved embedding to local storage: %s", emb_path)
             return None
         except Exception as local_e:
@@ -0,0 +1,534 @@
+"""
+DMCA Report HTML Preview
+Renders the web preview of a DMCA takedown notice.
+
+Kept separate from dmca_pdf_generator so preview-only callers do not import
+ReportLab.
+"""
+
+import hashlib
+from datetime import date, datetime
+from functools import lru_cache
+from html import escape
+from string import Template
+from typing import Any, Optional
+
+
+def _truncate(text: str, max_length: int) -> str:
+    """Truncate text to max length with ellipsis."""
+    if not text:
+        return "N/A"
+    return _truncate_cached(text if isinstance(text, str) else str(text), max_length)
+
+
+@lru_cache(maxsize=2048)
+def _truncate_cached(text: str, max_length: int) -> str:
+    # Batches repeat the same titles/domains/alt text, so results are memoized
+    text = text.strip()
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 3] + "..."
+
+
+# '0.0%' ... '100.0%' in tenths of a percent, formatted once at import; scores are 0.0-1.0
+_PCT_STRINGS = tuple(f"{tenths / 10:.1f}%" for tenths in range(1001))
+
+
+def _similarity_pct(score: Any) -> Optional[str]:
+    """Similarity score as a percentage string, from the prebuilt table when in range."""
+    if not score:
+        return None
+    tenths = round(float(score) * 1000)
+    if 0 <= tenths <= 1000:
+        return _PCT_STRINGS[tenths]
+    return f"{float(score) * 100:.1f}%"
+
+
+@lru_cache(maxsize=4096)
+def _long_date(day: date) -> str:
+    # Reports in a batch share a handful of dates, so the strftime result is memoized per day
+    return day.strftime('%B %d, %Y')
+
+
+def format_report_context(report: Any) -> dict:
+    """
+    Per-report values shared by the PDF and HTML renderers, with None handling
+    in one place. Callers rendering both formats compute this once and pass it
+    to each.
+    """
+    user = report.user
+    return {
+        'status': (report.status or 'pending').upper(),
+        'similarity_pct': _similarity_pct(report.similarity_score),
+        'detected_at': report.detected_at or report.created_at,
+        'user_name': (user.full_name or user.username) if user else None,
+    }
+
+
+# Copyright holder fields the renderers print; also part of report_content_key
+_USER_FIELDS = (
+    'id', 'username', 'full_name', 'email', 'phone_number',
+    'address', 'street_address', 'city', 'state', 'zip_code', 'country',
+)
+
+
+def report_content_key(report: Any) -> str:
+    """
+    Hash of the fields that change a rendered report, including the holder's
+    profile fields printed in the notice. Reports are rarely edited after
+    creation, so callers cache PDF/HTML output under this key and skip the
+    render when an unchanged report is downloaded again.
+    """
+    updated_at = report.updated_at
+    user = report.user
+    user_material = repr([getattr(user, field, None) for field in _USER_FIELDS]) if user else ""
+    material = f"{report.id}:{updated_at.timestamp() if updated_at else 0}:{report.status}:{user_material}"
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+# ========== HTML PREVIEW GENERATOR ==========
+# Static markup is written as string.Template sources and compiled once at import
+# (see _split_template/_template_formatter below); each preview only escapes its
+# dynamic fields and joins precompiled fragments.
+_HTML_ROW_TEMPLATE = Template("""<div class="info-row">
+                            <div class="info-label">${label}</div>
+                            <div class="info-value">${value}</div>
+                        </div>""")
+
+_HTML_COMMERCIAL_TEMPLATE = Template("""<div class="alert">
+                    <h3>🚨 COMMERCIAL USE DETECTED</h3>
+                    <p>The infringing content is being used for commercial purposes, which constitutes a more serious violation.</p>
+                    <div class="info-grid" style="margin-top: 15px;">
+                        <div class="info-row">
+                            <div class="info-label">Commercial Use:</div>
+                            <div class="info-value"><strong>YES - Content being sold</strong></div>
+                        </div>
+                        ${rows}
+                    </div>
+                </div>""")
+
+_HTML_METADATA_TEMPLATE = Template("""<div class="section">
+                    <h2>📄 Page Metadata</h2>
+                    <div class="info-grid">
+                        ${rows}
+                    </div>
+                </div>""")
+
+_HTML_TEMPLATE = Template("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>DMCA Report #${report_id}</title>
+        <style>
+            * {
+                margin: 0;
+                padding: 0;
+                box-sizing: border-box;
+            }
+            body {
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                padding: 20px;
+            }
+            .container {
+                max-width: 900px;
+                margin: 0 auto;
+                background: white;
+                border-radius: 12px;
+                box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+                overflow: hidden;
+            }
+            .header {
+                background: linear-gradient(135deg, #2c5282 0%, #2b6cb0 100%);
+                color: white;
+                padding: 40px 30px;
+                text-align: center;
+            }
+            .header h1 {
+                font-size: 28px;
+                margin-bottom: 10px;
+                font-weight: 700;
+            }
+            .header p {
+                font-size: 14px;
+                opacity: 0.9;
+            }
+            .report-id {
+                background: rgba(255,255,255,0.2);
+                display: inline-block;
+                padding: 8px 20px;
+                border-radius: 20px;
+                margin-top: 15px;
+                font-weight: 600;
+            }
+            .content {
+                padding: 30px;
+            }
+            .section {
+                background: #f8f9fa;
+                padding: 25px;
+                margin-bottom: 20px;
+                border-radius: 8px;
+                border-left: 4px solid #2c5282;
+            }
+            .section h2 {
+                color: #2c5282;
+                font-size: 18px;
+                margin-bottom: 15px;
+                padding-bottom: 10px;
+                border-bottom: 2px solid #e2e8f0;
+            }
+            .info-grid {
+                display: grid;
+                gap: 12px;
+            }
+            .info-row {
+                display: grid;
+                grid-template-columns: 150px 1fr;
+                padding: 12px;
+                background: white;
+                border-radius: 6px;
+                border: 1px solid #e2e8f0;
+            }
+            .info-label {
+                font-weight: 600;
+                color: #4a5568;
+            }
+            .info-value {
+                color: #2d3748;
+                word-break: break-word;
+            }
+            .info-value a {
+                color: #2b6cb0;
+                text-decoration: none;
+                font-weight: 500;
+            }
+            .info-value a:hover {
+                text-decoration: underline;
+            }
+            .alert {
+                background: #fff5f5;
+                border: 2px solid #fc8181;
+                border-radius: 8px;
+                padding: 20px;
+                margin: 20px 0;
+            }
+            .alert h3 {
+                color: #c53030;
+                margin-bottom: 10px;
+                font-size: 16px;
+            }
+            .badge {
+                display: inline-block;
+                padding: 4px 12px;
+                border-radius: 12px;
+                font-size: 12px;
+                font-weight: 600;
+                text-transform: uppercase;
+            }
+            .badge-success {
+                background: #c6f6d5;
+                color: #22543d;
+            }
+            .badge-warning {
+                background: #feebc8;
+                color: #744210;
+            }
+            .badge-danger {
+                background: #fed7d7;
+                color: #742a2a;
+            }
+            .footer {
+                background: #2d3748;
+                color: #cbd5e0;
+                padding: 25px;
+                text-align: center;
+                font-size: 13px;
+            }
+            .footer a {
+                color: #90cdf4;
+                text-decoration: none;
+            }
+            @media (max-width: 768px) {
+                .info-row {
+                    grid-template-columns: 1fr;
+                    gap: 5px;
+                }
+                .content {
+                    padding: 20px;
+                }
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>⚖️ DMCA TAKEDOWN NOTICE</h1>
+                <p>Digital Millennium Copyright Act - 17 U.S.C. § 512(c)(3)</p>
+                <div class="report-id">Report ID: #${report_id}</div>
+            </div>
+            
+            <div class="content">
+                <!-- Status Badge -->
+                <div style="text-align: center; margin-bottom: 20px;">
+                    <span class="badge ${status_badge}">
+                        Status: ${status}
+                    </span>
+                </div>
+                
+                <!-- Copyright Holder -->
+                <div class="section">
+                    <h2>📋 Copyright Holder Information</h2>
+                    <div class="info-grid">
+                        <div class="info-row">
+                            <div class="info-label">Name:</div>
+                            <div class="info-value">${user_name}</div>
+                        </div>
+                        ${email_row}
+                        ${phone_row}
+                        <div class="info-row">
+                            <div class="info-label">User ID:</div>
+                            <div class="info-value">#${user_id}</div>
+                        </div>
+                    </div>
+                </div>
+                
+                <!-- Original Work -->
+                <div class="section">
+                    <h2>🎨 Original Copyrighted Work</h2>
+                    <div class="info-grid">
+                        <div class="info-row">
+                            <div class="info-label">Original URL:</div>
+                            <div class="info-value">
+                                <a href="${original_image_url}" target="_blank">
+                                    View Original Work →
+                                </a>
+                            </div>
+                        </div>
+                        ${caption_row}
+                        <div class="info-row">
+                            <div class="info-label">Created:</div>
+                            <div class="info-value">${created}</div>
+                        </div>
+                    </div>
+                </div>
+                
+                <!-- Infringing Content -->
+                <div class="section">
+                    <h2>⚠️ Infringing Content Location</h2>
+                    <div class="info-grid">
+                        <div class="info-row">
+                            <div class="info-label">Infringing URL:</div>
+                            <div class="info-value">
+                                <a href="${infringing_url}" target="_blank">
+                                    View Infringing Content →
+                                </a>
+                            </div>
+                        </div>
+                        ${domain_row}
+                        ${website_row}
+                        <div class="info-row">
+                            <div class="info-label">Match Accuracy:</div>
+                            <div class="info-value">${similarity} similarity</div>
+                        </div>
+                        <div class="info-row">
+                            <div class="info-label">Detected:</div>
+                            <div class="info-value">${detected}</div>
+                        </div>
+                    </div>
+                </div>
+                
+                <!-- Commercial Use Alert -->
+                ${commercial_section}
+                
+                <!-- Page Details -->
+                ${metadata_section}
+                
+                <!-- Legal Statements -->
+                <div class="section">
+                    <h2>⚖️ Legal Declarations</h2>
+                    <p style="margin-bottom: 15px;">
+                        <strong>Good Faith Belief:</strong> I have a good faith belief that the use of the copyrighted 
+                        materials described above is not authorized by the copyright owner, its agent, or the law.
+                    </p>
+                    <p>
+                        <strong>Penalty of Perjury:</strong> I swear, under penalty of perjury, that the information 
+                        in this notification is accurate and that I am the copyright owner or authorized to act on 
+                        behalf of the owner.
+                    </p>
+                </div>
+                
+                <!-- Required Actions -->
+                <div class="section">
+                    <h2>📋 Required Actions</h2>
+                    <p style="margin-bottom: 10px;"><strong>You must:</strong></p>
+                    <ol style="margin-left: 20px; color: #2d3748;">
+                        <li>Remove or disable access to the infringing material immediately</li>
+                        <li>Provide written confirmation of removal within 48 hours</li>
+                        <li>Notify the alleged infringer of this takedown notice</li>
+                        <li>Preserve all evidence for potential legal proceedings</li>
+                    </ol>
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p><strong>Generated by Sentinel AI</strong> | ${generated}</p>
+                <p style="margin-top: 10px;">
+                    Report ID: ${report_id} | Match ID: ${match_id}<br/>
+                    This document is issued under the DMCA, 17 U.S.C. § 512(c)(3)
+                </p>
+                <p style="margin-top: 15px;">
+                    <a href="https://sentinelai.com">sentinelai.com</a> | 
+                    <a href="mailto:dmca@sentinelai.com">dmca@sentinelai.com</a> | 
+                    <a href="mailto:support@sentinelai.com">support@sentinelai.com</a>
+                </p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """)
+
+
+# Page metadata rows as (label, report attribute, max length or None), mirroring the PDF's _METADATA_FIELDS
+_HTML_METADATA_FIELDS = (
+    ('Page Title:', 'page_title', None),
+    ('Description:', 'page_description', 203),
+    ('Author:', 'page_author', None),
+    ('Image Alt:', 'suspected_image_alt', None),
+)
+
+
+def _split_template(template: Template) -> tuple:
+    """Split a Template into its literal text fragments and the placeholder names between them."""
+    literals, names, buffer, pos = [], [], '', 0
+    source = template.template
+    for match in template.pattern.finditer(source):
+        buffer += source[pos:match.start()]
+        pos = match.end()
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            buffer += '$'
+            continue
+        literals.append(buffer)
+        names.append(name)
+        buffer = ''
+    literals.append(buffer + source[pos:])
+    return tuple(literals), tuple(names)
+
+
+def _template_formatter(template: Template):
+    """Compile a Template into a bound str.format, a single C-level pass per call instead of a regex substitute()."""
+    literals, names = _split_template(template)
+    escaped = [literal.replace('{', '{{').replace('}', '}}') for literal in literals]
+    return (escaped[0] + ''.join(f'{{{name}}}' + literal for name, literal in zip(names, escaped[1:]))).format
+
+
+# The full page as constant bytes fragments (CSS, static sections) interleaved with field names
+_html_literals, _HTML_FIELDS = _split_template(_HTML_TEMPLATE)
+_HTML_LITERALS = tuple(literal.encode() for literal in _html_literals)
+
+# Row and section snippets, filled with keyword arguments
+_format_row = _template_formatter(_HTML_ROW_TEMPLATE)
+_format_commercial = _template_formatter(_HTML_COMMERCIAL_TEMPLATE)
+_format_metadata = _template_formatter(_HTML_METADATA_TEMPLATE)
+
+
+def _h(value: Any) -> str:
+    """HTML-escape a dynamic value exactly once; empty values render as N/A."""
+    return escape(str(value), quote=True) if value else 'N/A'
+
+
+def _safe_href(url: Optional[str]) -> str:
+    """Escaped href for http(s) URLs only; anything else (javascript:, data:, ...) becomes '#'."""
+    # Only the scheme needs case-folding, not the whole (often long, query-heavy) URL.
+    # html.escape's chained C-level replaces beat a str.translate table here: translate
+    # falls back to a per-character dict lookup when replacements are multi-character.
+    if url and url[:8].lower().startswith(('http://', 'https://')):
+        return escape(url, quote=True)
+    return '#'
+
+
+def _html_row(label: str, value: Any) -> str:
+    """Render one label/value row, or nothing when the value is empty."""
+    if not value:
+        return ''
+    return _format_row(label=label, value=_h(value))
+
+
+def generate_dmca_html_preview(
+    report: Any,
+    context: Optional[dict] = None,
+    generated_at: Optional[datetime] = None,
+) -> bytes:
+    """
+    Generate HTML preview of DMCA report for web display.
+    
+    Args:
+        report: DmcaReports model instance
+        context: Precomputed format_report_context(report), if already available
+        generated_at: Generation timestamp (UTC) shown in the footer; pass the
+            PDF's value when rendering both. Defaults to now.
+        
+    Returns:
+        UTF-8 encoded HTML; serve with media_type='text/html; charset=utf-8'
+    """
+    # Each report attribute is read once into a local; ORM instrumented reads are not free
+    user = report.user
+    status = report.status
+    email = getattr(user, 'email', None)
+    phone = getattr(user, 'phone_number', None)
+    metadata = {attr: getattr(report, attr, None) for _, attr, _ in _HTML_METADATA_FIELDS}
+    context = context or format_report_context(report)
+    user_name = context['user_name'] or f"User #{report.user_id}"
+    detected_at = context['detected_at']
+    created_at = report.created_at
+    
+    ctx = {
+        'report_id': _h(report.id),
+        'status_badge': 'badge-success' if status == 'sent' else 'badge-warning',
+        'status': _h(context['status']),
+        'user_name': _h(user_name),
+        'user_id': _h(report.user_id),
+        'match_id': _h(report.match_id),
+        'original_image_url': _safe_href(report.original_image_url),
+        'infringing_url': _safe_href(report.infringing_url),
+        'email_row': '',
+        'phone_row': _html_row('Phone:', phone),
+        'caption_row': _html_row('Description:', report.image_caption),
+        'domain_row': _html_row('Domain:', report.source_domain),
+        'website_row': _html_row('Website:', report.source_name),
+        'created': _long_date(created_at.date()) if created_at else 'N/A',
+        'similarity': context['similarity_pct'] or '0.0%',
+        'detected': detected_at.strftime('%B %d, %Y at %I:%M %p UTC') if detected_at else 'N/A',
+        'generated': (generated_at or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S UTC'),
+        'commercial_section': '',
+        'metadata_section': '',
+    }
+    
+    if email:
+        email = _h(email)
+        ctx['email_row'] = _format_row(label='Email:', value=f'<a href="mailto:{email}">{email}</a>')
+    
+    if report.is_product:
+        price = report.product_price
+        price = f"{report.product_currency or '$'}{price}" if price else None
+        ctx['commercial_section'] = _format_commercial(rows=''.join([
+            _html_row('Listed Price:', price),
+            _html_row('Platform:', report.marketplace),
+        ]))
+    
+    if metadata['page_title'] or metadata['page_description']:
+        ctx['metadata_section'] = _format_metadata(rows=''.join(
+            _html_row(label, _truncate(metadata[attr], limit) if limit and metadata[attr] else metadata[attr])
+            for label, attr, limit in _HTML_METADATA_FIELDS
+        ))
+    
+    parts = [_HTML_LITERALS[0]]
+    for name, literal in zip(_HTML_FIELDS, _HTML_LITERALS[1:]):
+        parts.append(ctx[name].encode())
+        parts.append(literal)
+    return b"".join(parts)
@@ -17,19 +17,347 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
     PageBreak, KeepTogether, HRFlowable, Image as RLImage
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
 from datetime import datetime
-from typing import Any, Optional
+from functools import lru_cache
+from html import escape
+from io import BytesIO
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import os
 import tempfile
-from urllib.parse import urlparse
+import textwrap
+
+# The HTML preview needs no ReportLab and lives in its own module; re-exported
+# here for existing imports.
+from ip_service.services.dmca_html_preview import (  # noqa: F401
+    _USER_FIELDS, _long_date, _truncate, format_report_context, generate_dmca_html_preview, report_content_key
+)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+_PDF_WRITE_BUFFER = 1 << 20  # 1 MiB
+
+# Palette, parsed from hex once at import
+_COLOR_TITLE = colors.HexColor('#1a1a1a')
+_COLOR_BRAND = colors.HexColor('#2c5282')
+_COLOR_BRAND_TINT = colors.HexColor('#EBF8FF')
+_COLOR_SUBHEADING = colors.HexColor('#2d3748')
+_COLOR_MUTED = colors.HexColor('#4a5568')
+_COLOR_FOOTER = colors.HexColor('#718096')
+_COLOR_LABEL_GREY = colors.HexColor('#F7FAFC')
+_COLOR_LABEL_GREEN = colors.HexColor('#F0FDF4')
+_COLOR_LABEL_RED = colors.HexColor('#FEF2F2')
+_COLOR_ALERT_TINT = colors.HexColor('#FFF5F5')
+_COLOR_ALERT = colors.HexColor('#EF4444')
+_COLOR_LABEL_AMBER = colors.HexColor('#FFFBEB')
+
+
+# Standard fonts the notice uses (plain, <b> labels/headings, <i> footer). Loading their
+# metrics at import puts them in ReportLab's font registry before the first build, and
+# batch workers inherit or load them once per process.
+_DOCUMENT_FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique')
+for _font_name in _DOCUMENT_FONTS:
+    pdfmetrics.getFont(_font_name)
+
+# ========== DIMENSIONS ==========
+_PAGE_MARGIN = 1*inch
+_PAGE_MARGIN_VERTICAL = 0.75*inch
+_COL_LABEL, _COL_VALUE = 2*inch, 4*inch
+
+# Spacer prototypes, one per height. ReportLab sets canv/_frame on a flowable while
+# drawing it, so stories get copies, like the other prebuilt flowables.
+_SPACER_XS = Spacer(1, 0.1*inch)
+_SPACER_SM = Spacer(1, 0.15*inch)
+_SPACER_MD = Spacer(1, 0.2*inch)
+_SPACER_LG = Spacer(1, 0.3*inch)
+_SPACER_XL = Spacer(1, 0.4*inch)
+_SPACER_XXL = Spacer(1, 0.5*inch)
+
+# ========== STYLES ==========
+# Built once at import; ReportLab only reads styles while building, so they are
+# shared by every generated report.
+_BASE_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'LegalTitle',
+    parent=_BASE_STYLES['Heading1'],
+    fontSize=20,
+    textColor=_COLOR_TITLE,
+    spaceAfter=20,
+    spaceBefore=10,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold',
+    leading=24
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'LegalHeading',
+    parent=_BASE_STYLES['Heading2'],
+    fontSize=13,
+    textColor=_COLOR_BRAND,
+    spaceAfter=10,
+    spaceBefore=15,
+    fontName='Helvetica-Bold',
+    leading=16,
+    borderWidth=1,
+    borderColor=_COLOR_BRAND,
+    borderPadding=5,
+    backColor=_COLOR_BRAND_TINT
+)
+
+_SUBHEADING_STYLE = ParagraphStyle(
+    'Subheading',
+    parent=_BASE_STYLES['Heading3'],
+    fontSize=11,
+    textColor=_COLOR_SUBHEADING,
+    spaceAfter=8,
+    spaceBefore=10,
+    fontName='Helvetica-Bold'
+)
+
+_BODY_STYLE = ParagraphStyle(
+    'LegalBody',
+    parent=_BASE_STYLES['BodyText'],
+    fontSize=10,
+    spaceAfter=10,
+    alignment=TA_JUSTIFY,
+    leading=14
+)
+
+_BOLD_BODY_STYLE = ParagraphStyle(
+    'BoldBody',
+    parent=_BODY_STYLE,
+    fontName='Helvetica-Bold'
+)
+
+_SMALL_STYLE = ParagraphStyle(
+    'SmallText',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=9,
+    textColor=_COLOR_MUTED,
+    leading=12
+)
+
+_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=8,
+    textColor=_COLOR_FOOTER,
+    alignment=TA_CENTER,
+    leading=10
+)
+
+# Table cell text; long values are wrapped as Paragraphs so each table lays out in one pass
+_CELL_STYLE = ParagraphStyle(
+    'TableCell',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=10,
+    leading=12
+)
+
+_METADATA_CELL_STYLE = ParagraphStyle(
+    'MetadataCell',
+    parent=_CELL_STYLE,
+    fontSize=9,
+    leading=11
+)
+
+# Values up to this length stay plain strings; longer ones become wrapped Paragraphs
+_PLAIN_CELL_MAX = 60
+# Hard cap for any single cell value
+_CELL_HARD_MAX = 500
+# Tables longer than this are split so ReportLab never lays out one huge table
+_TABLE_CHUNK_ROWS = 50
+
+_TABLE_STYLES: Dict[tuple, TableStyle] = {}
+
+
+def _make_table_style(
+    background: colors.Color,
+    border: colors.Color = colors.grey,
+    border_width: float = 0.5,
+    font_size: int = 10,
+    padding: int = 10,
+    valign: str = 'TOP',
+    shade_all: bool = False,
+) -> TableStyle:
+    """
+    Shared style for the two-column label/value tables: shaded label column
+    (or whole table), bold labels, grid. Tables differing only in colour or
+    spacing get the same TableStyle instance for the same parameters.
+    """
+    key = (background.hexval(), border.hexval(), border_width, font_size, padding, valign, shade_all)
+    style = _TABLE_STYLES.get(key)
+    if style is None:
+        style = _TABLE_STYLES[key] = TableStyle([
+            ('BACKGROUND', (0, 0), (-1 if shade_all else 0, -1), background),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), font_size),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+            ('TOPPADDING', (0, 0), (-1, -1), padding),
+            ('GRID', (0, 0), (-1, -1), border_width, border),
+            ('VALIGN', (0, 0), (-1, -1), valign),
+        ])
+    return style
+
+
+_REPORT_INFO_TABLE_STYLE = _make_table_style(_COLOR_LABEL_GREY, padding=8, valign='MIDDLE')
+_USER_TABLE_STYLE = _make_table_style(_COLOR_BRAND_TINT)
+_ORIGINAL_TABLE_STYLE = _make_table_style(_COLOR_LABEL_GREEN)
+_INFRINGING_TABLE_STYLE = _make_table_style(_COLOR_LABEL_RED)
+_COMMERCIAL_TABLE_STYLE = _make_table_style(_COLOR_ALERT_TINT, border=_COLOR_ALERT, border_width=1, shade_all=True)
+_METADATA_TABLE_STYLE = _make_table_style(_COLOR_LABEL_AMBER, font_size=9, padding=8)
+_CONTACT_TABLE_STYLE = _make_table_style(_COLOR_LABEL_GREY, padding=8, valign='MIDDLE')
+_SIGNATURE_TABLE_STYLE = _make_table_style(_COLOR_LABEL_AMBER, border_width=1, valign='MIDDLE', shade_all=True)
+
+
+# ========== STATIC LEGAL TEXT ==========
+# The fixed legal paragraphs are parsed once at import. Each build appends a
+# shallow copy, so per-document layout state never touches the shared prototype.
+_CAPACITY_PARA = Paragraph("""
+    The above-named individual ("Copyright Holder") is the owner or authorized agent of the
+    copyrighted work described herein and has the legal authority to act on behalf of the
+    copyright owner in this matter.
+""", _SMALL_STYLE)
+
+_COMMERCIAL_PARA = Paragraph("""
+    <b>IMPORTANT:</b> The infringing content is being used for commercial purposes,
+    which constitutes a more serious violation of copyright law and may result in
+    enhanced statutory damages.
+""", _BODY_STYLE)
+
+_GOOD_FAITH_PARA = Paragraph("""
+    I have a good faith belief that the use of the copyrighted material described above
+    in the manner complained of is not authorized by the copyright owner, its agent, or
+    the law. The use of this material does not fall under fair use, fair dealing, or any
+    other exception to copyright infringement.
+""", _BODY_STYLE)
+
+_ACCURACY_PARA = Paragraph("""
+    I declare, under penalty of perjury under the laws of the United States of America
+    and under applicable international treaties, that the information contained in this
+    notification is accurate. I further declare that I am the copyright owner or am
+    authorized to act on behalf of the owner of an exclusive right that is allegedly
+    infringed.
+""", _BODY_STYLE)
+
+_AUTHORIZATION_PARA = Paragraph("""
+    The undersigned is authorized to act on behalf of the copyright owner and has been
+    granted full authority to enforce the copyrights in the identified work(s). This
+    authorization includes the right to submit DMCA takedown notices and pursue legal
+    remedies for copyright infringement.
+""", _BODY_STYLE)
+
+_ACTIONS_INTRO_PARA = Paragraph("""
+    Pursuant to the Digital Millennium Copyright Act (17 U.S.C. § 512), you are hereby
+    required to take the following actions expeditiously:
+""", _BODY_STYLE)
+
+_TIMELINE_PARA = Paragraph("""
+    <b>Response Timeline:</b> You must respond to this notice within 48 hours. Failure to
+    comply may result in further legal action, including but not limited to filing a lawsuit
+    for copyright infringement, seeking statutory damages up to $150,000 per work infringed,
+    and pursuing injunctive relief.
+""", _BODY_STYLE)
+
+_CONSEQUENCES_PARA = Paragraph("""
+    Failure to remove the infringing content may result in:
+    <br/><br/>
+    • <b>Civil Liability:</b> Statutory damages of $750 to $30,000 per work infringed,
+    or up to $150,000 per work if the infringement is found to be willful<br/>
+    • <b>Injunctive Relief:</b> Court orders to cease all infringing activities<br/>
+    • <b>Attorney Fees:</b> Payment of the Copyright Holder's legal costs and attorney fees<br/>
+    • <b>Loss of Safe Harbor:</b> Forfeiture of DMCA safe harbor protections under 17 U.S.C. § 512<br/>
+    • <b>Criminal Penalties:</b> In cases of willful infringement for commercial advantage,
+    criminal prosecution under 17 U.S.C. § 506
+""", _BODY_STYLE)
+
+_SIGNATURE_PARA = Paragraph("""
+    By submitting this notice, the Copyright Holder hereby electronically signs this
+    document and affirms that all statements herein are true and accurate under penalty
+    of perjury.
+""", _BODY_STYLE)
+
+_ORIGINAL_INTRO_PARA = Paragraph(
+    "The Copyright Holder owns the following original copyrighted work:", _BODY_STYLE
+)
+
+_INFRINGING_INTRO_PARA = Paragraph(
+    "The copyrighted work identified above is being used without authorization at the following location:",
+    _BODY_STYLE
+)
+
+_CONTACT_INTRO_PARA = Paragraph(
+    "For questions or to provide compliance confirmation, contact:", _BODY_STYLE
+)
+
+_AGENT_CONTACT_ROWS = (
+    ('DMCA Agent:', 'Sentinel AI Legal Department'),
+    ('Agent Email:', 'dmca@sentinelai.com'),
+    ('Agent Phone:', '+1 (555) 123-4567'),
+    ('Website:', 'https://sentinelai.com/dmca'),
+)
+
+_ACTIONS = (
+    "Remove or disable access to the infringing material identified in Section III of this notice",
+    "Notify the alleged infringer of the removal or disabling of access to the material",
+    "Provide written confirmation of compliance to the Copyright Holder within 48 hours",
+    "Implement repeat infringer policies in accordance with 17 U.S.C. § 512(i)",
+    "Preserve all evidence related to this infringement for potential legal proceedings"
+)
+# Numbered action items carry their own trailing gap instead of a Spacer after each
+_ACTION_STYLE = ParagraphStyle(
+    'ActionItem',
+    parent=_BODY_STYLE,
+    spaceAfter=_BODY_STYLE.spaceAfter + 0.05*inch
+)
+_ACTION_PARAS = tuple(
+    Paragraph(f"<b>{i}.</b> {action}", _ACTION_STYLE) for i, action in enumerate(_ACTIONS, 1)
+)
+
+
+def _format_tags(report: Any) -> Optional[str]:
+    if not report.page_tags:
+        return None
+    if isinstance(report.page_tags, list):
+        return ', '.join(map(str, islice(report.page_tags, 10)))
+    return str(report.page_tags)
+
+
+def _format_dimensions(report: Any) -> Optional[str]:
+    if report.image_width and report.image_height:
+        return f"{report.image_width} × {report.image_height} pixels"
+    return None
+
+
+# Section IV rows in display order: (label, report attribute or formatter, wrap width).
+# Rows whose value is empty are skipped.
+_METADATA_FIELDS = (
+    ('Page Title:', 'page_title', 60),
+    ('Website Name:', 'source_name', None),
+    ('Domain:', 'source_domain', None),
+    ('Page Description:', 'page_description', 80),
+    ('Author/Publisher:', 'page_author', None),
+    ('Their Copyright Notice:', 'page_copyright', 60),
+    ('Image Alt Text:', 'suspected_image_alt', 60),
+    ('Image Title:', 'suspected_image_title', 60),
+    ('Keywords/Tags:', _format_tags, 70),
+    ('Image Identified As:', 'best_guess', None),
+    ('Search Result Position:', lambda report: report.serp_position and f"#{report.serp_position}", None),
+    ('Image Dimensions:', _format_dimensions, None),
+    ('Image Format:', lambda report: report.image_format and report.image_format.upper(), None),
+)
 
 
 def truncate_url_for_display(url: str, max_length: int = 50) -> str:
@@ -40,19 +368,33 @@ def truncate_url_for_display(url: str, max_length: int = 50) -> str:
     if not url or len(url) <= max_length:
         return url or "N/A"
     
-    try:
-        parsed = urlparse(url)
-        domain = parsed.netloc or "unknown"
-        path_parts = parsed.path.split('/')
-        filename = path_parts[-1] if path_parts else ""
-        
-        if len(filename) > 30:
-            filename = filename[:27] + "..."
-        
-        return f"{domain}/.../{filename}"
-    except:
-        # Fallback: simple truncation
-        return url[:max_length-3] + "..."
+    # Plain index scans instead of urlparse: drop query/fragment, then take the
+    # netloc and the last path segment
+    end = len(url)
+    for separator in '?#':
+        index = url.find(separator, 0, end)
+        if index >= 0:
+            end = index
+    
+    scheme_end = url.find('://', 0, end)
+    if scheme_end >= 0:
+        domain_start = scheme_end + 3
+        domain_end = url.find('/', domain_start, end)
+        if domain_end < 0:
+            domain_end = end
+        domain = url[domain_start:domain_end] or "unknown"
+    else:
+        domain = "unknown"
+        domain_end = 0
+    
+    filename = url[domain_end:end].rpartition('/')[2]
+    if len(filename) > 30:
+        filename = filename[:27] + "..."
+    
+    return f"{domain}/.../{filename}"
+
+
+_LINK_TEMPLATE = '<link href="{}" color="blue"><u>{}</u></link>'.format
 
 
 def create_clickable_link(url: str, display_text: str = None) -> str:
@@ -67,1047 +409,601 @@ def create_clickable_link(url: str, display_text: str = None) -> str:
     if not display_text:
         display_text = truncate_url_for_display(url, 60)
     
-    # Return link in reportlab format
-    return f'<link href="{url}" color="blue"><u>{display_text}</u></link>'
+    # Escape both parts: a raw & or " in a scraped URL breaks ReportLab's markup parser
+    return _LINK_TEMPLATE(escape(url, quote=True), escape(display_text, quote=False))
+
+
+# Report/user attributes read by generate_dmca_pdf; used to build picklable DTOs
+_REPORT_FIELDS = (
+    'id', 'user_id', 'match_id', 'status', 'created_at', 'detected_at',
+    'original_image_url', 'image_caption', 'copyright_registration',
+    'infringing_url', 'suspected_image_url', 'screenshot_url', 'similarity_score',
+    'is_product', 'product_price', 'product_currency', 'marketplace',
+    'source_name', 'source_domain', 'page_metadata', 'page_title', 'page_description',
+    'page_author', 'page_copyright', 'page_tags', 'suspected_image_alt',
+    'suspected_image_title', 'best_guess', 'serp_position',
+    'image_width', 'image_height', 'image_format',
+)
+
+
+def _report_to_dto(report: Any) -> Dict[str, Any]:
+    """Copy the fields the PDF needs off an ORM report into a plain, picklable dict."""
+    dto = {field: getattr(report, field, None) for field in _REPORT_FIELDS}
+    user = report.user
+    dto['user'] = {field: getattr(user, field, None) for field in _USER_FIELDS} if user else None
+    return dto
+
+
+def _dto_to_report(dto: Dict[str, Any]) -> SimpleNamespace:
+    user = dto.get('user')
+    fields = {field: dto.get(field) for field in _REPORT_FIELDS}
+    return SimpleNamespace(**fields, user=SimpleNamespace(**user) if user else None)
+
 
+def _generate_pdf_worker(job: tuple) -> str:
+    dto, output_path, generated_at = job
+    return generate_dmca_pdf(dto, output_path, generated_at=generated_at)
 
-def generate_dmca_pdf(report: Any, output_path: Optional[str] = None) -> str:
+
+def _pdf_jobs(reports: List[Any], output_dir: str) -> List[tuple]:
+    """Worker jobs (dto, output path, generated_at) for a batch; DTOs are built in the caller's process."""
+    os.makedirs(output_dir, exist_ok=True)
+    # One "generated at" timestamp for the whole batch
+    generated_at = datetime.utcnow()
+    jobs = []
+    for report in reports:
+        dto = report if isinstance(report, dict) else _report_to_dto(report)
+        jobs.append((dto, os.path.join(output_dir, f"dmca_report_{dto['id']}.pdf"), generated_at))
+    return jobs
+
+
+def generate_dmca_pdfs(
+    reports: List[Any],
+    output_dir: str,
+    max_workers: Optional[int] = None,
+    chunksize: int = 4,
+) -> List[str]:
+    """
+    Generate PDFs for many reports in parallel worker processes.
+    
+    PDF building is CPU-bound pure Python, so separate processes sidestep the GIL.
+    Reports are converted to DTOs in the caller, so ORM sessions never cross
+    process boundaries. Call this from a background job, not a request handler.
+    
+    Memory: every worker imports ReportLab and holds one document while it
+    builds (tens of MB per process), and all DTOs are materialized up front,
+    so lower max_workers on small hosts.
+    
+    Args:
+        reports: DmcaReports instances (user relationship loaded) or DTO dicts
+        output_dir: Directory for the PDFs; each is named after its report ID,
+            so report IDs must be distinct
+        max_workers: Worker process count (defaults to the CPU count, capped
+            at the number of reports)
+        chunksize: Reports sent to a worker per task; amortizes pickling and
+            IPC round-trips across several small documents
+        
+    Returns:
+        Paths of the generated PDFs, in the same order as reports
+    """
+    jobs = _pdf_jobs(reports, output_dir)
+    
+    # A pool costs more to start than one report takes to render
+    if len(jobs) <= 1:
+        return [_generate_pdf_worker(job) for job in jobs]
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_generate_pdf_worker, jobs, chunksize=chunksize))
+
+
+def iter_dmca_pdfs(
+    reports: List[Any],
+    output_dir: str,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Generate PDFs in worker processes and yield (report_id, path) as each one finishes.
+    
+    Unlike generate_dmca_pdfs, callers can start sending or uploading the first
+    notices while the rest are still rendering, and one failed report is logged
+    and skipped instead of aborting the batch.
+    
+    Args:
+        reports: DmcaReports instances (user relationship loaded) or DTO dicts
+        output_dir: Directory for the PDFs, named after each report ID
+        max_workers: Worker process count (defaults to the CPU count, capped
+            at the number of reports)
+    
+    Yields:
+        (report_id, path) in completion order
+    """
+    jobs = _pdf_jobs(reports, output_dir)
+    if not jobs:
+        return
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_generate_pdf_worker, job): job[0]['id'] for job in jobs}
+        for future in as_completed(futures):
+            report_id = futures[future]
+            try:
+                yield report_id, future.result()
+            except Exception:
+                logger.exception(f"❌ Failed to generate DMCA PDF for report {report_id} in batch")
+
+
+def generate_dmca_pdf(
+    report: Any,
+    output: Union[str, BinaryIO, None] = None,
+    generated_at: Optional[datetime] = None,
+    context: Optional[dict] = None,
+) -> Union[str, BinaryIO]:
     """
     Generate a comprehensive, legally compliant DMCA takedown notice PDF.
     
     Args:
-        report: DmcaReports model instance with user relationship loaded
-        output_path: Optional path for output file. If None, creates temp file.
+        report: DmcaReports model instance with user relationship loaded,
+            or a DTO dict from _report_to_dto
+        output: Path for the output file, or a writable binary file-like object
+            (BytesIO, HTTP response, upload stream) to render straight into.
+            If None, creates a temp file.
+        generated_at: Generation timestamp (UTC) printed on the notice; batch
+            callers pass one value for every report. Defaults to now.
+        context: Precomputed format_report_context(report), when the caller also
+            renders the HTML preview for the same report
         
     Returns:
-        Path to generated PDF file
+        Path to generated PDF file, or the file-like object that was passed in
     """
+    if isinstance(report, dict):
+        report = _dto_to_report(report)
+    
+    generated_at = generated_at or datetime.utcnow()
+    
     try:
-        # Create output path if not provided
-        if not output_path:
-            output_path = os.path.join(
-                tempfile.gettempdir(), 
-                f"dmca_report_{report.id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-            )
-        
-        # Create PDF document with proper margins for legal documents
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=letter,
-            rightMargin=1*inch,
-            leftMargin=1*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.75*inch,
-        )
-        
-        # Container for PDF elements
-        story = []
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # ===== CUSTOM STYLES =====
-        title_style = ParagraphStyle(
-            'LegalTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=20,
-            spaceBefore=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold',
-            leading=24
-        )
-        
-        heading_style = ParagraphStyle(
-            'LegalHeading',
-            parent=styles['Heading2'],
-            fontSize=13,
-            textColor=colors.HexColor('#2c5282'),
-            spaceAfter=10,
-            spaceBefore=15,
-            fontName='Helvetica-Bold',
-            leading=16,
-            borderWidth=1,
-            borderColor=colors.HexColor('#2c5282'),
-            borderPadding=5,
-            backColor=colors.HexColor('#EBF8FF')
-        )
-        
-        subheading_style = ParagraphStyle(
-            'Subheading',
-            parent=styles['Heading3'],
-            fontSize=11,
-            textColor=colors.HexColor('#2d3748'),
-            spaceAfter=8,
-            spaceBefore=10,
-            fontName='Helvetica-Bold'
-        )
-        
-        body_style = ParagraphStyle(
-            'LegalBody',
-            parent=styles['BodyText'],
-            fontSize=10,
-            spaceAfter=10,
-            alignment=TA_JUSTIFY,
-            leading=14
-        )
-        
-        bold_body_style = ParagraphStyle(
-            'BoldBody',
-            parent=body_style,
-            fontName='Helvetica-Bold'
-        )
-        
-        small_style = ParagraphStyle(
-            'SmallText',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#4a5568'),
-            leading=12
-        )
-        
-        # ========== HEADER WITH LOGO/BRANDING ==========
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Main Title
-        story.append(Paragraph("DMCA TAKEDOWN NOTICE", title_style))
-        story.append(Paragraph(
-            "Digital Millennium Copyright Act - 17 U.S.C. § 512(c)(3)",
-            small_style
-        ))
-        story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#2c5282')))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== REPORT IDENTIFICATION ==========
-        report_date = report.created_at or datetime.utcnow()
-        report_info_data = [
-            ['Report ID:', f"#{report.id}"],
-            ['Issue Date:', report_date.strftime('%B %d, %Y at %I:%M %p UTC')],
-            ['Status:', (report.status or 'pending').upper()],
-            ['Detection Method:', 'Automated Image Recognition System'],
-        ]
-        
-        report_info_table = Table(report_info_data, colWidths=[2*inch, 4*inch])
-        report_info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F7FAFC')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        story.append(report_info_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== COPYRIGHT HOLDER INFORMATION ==========
-        story.append(Paragraph("I. COPYRIGHT HOLDER INFORMATION", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        # Get user information
-        user = report.user
-        user_data = []
-        
-        if user:
-            # Full name or username
-            full_name = user.full_name or user.username or "Not Provided"
-            user_data.append(['Full Legal Name:', full_name])
-            
-            # Email (required)
-            user_data.append(['Email Address:', user.email or "Not Provided"])
-            
-            # Phone (if available)
-            if hasattr(user, 'phone_number') and user.phone_number:
-                user_data.append(['Phone Number:', user.phone_number])
-            
-            # Address (if available)
-            if hasattr(user, 'address') and user.address:
-                user_data.append(['Mailing Address:', user.address])
-            elif hasattr(user, 'city') and user.city:
-                address_parts = []
-                if hasattr(user, 'street_address') and user.street_address:
-                    address_parts.append(user.street_address)
-                if user.city:
-                    address_parts.append(user.city)
-                if hasattr(user, 'state') and user.state:
-                    address_parts.append(user.state)
-                if hasattr(user, 'zip_code') and user.zip_code:
-                    address_parts.append(user.zip_code)
-                if hasattr(user, 'country') and user.country:
-                    address_parts.append(user.country)
-                if address_parts:
-                    user_data.append(['Mailing Address:', ', '.join(address_parts)])
-            
-            # User ID (for reference)
-            user_data.append(['User ID:', f"#{user.id}"])
-        else:
-            user_data.append(['Copyright Holder:', f"User ID #{report.user_id}"])
-            user_data.append(['Email Address:', "Available upon request"])
-        
-        user_table = Table(user_data, colWidths=[2*inch, 4*inch])
-        user_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#EBF8FF')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        story.append(user_table)
-        story.append(Spacer(1, 0.1*inch))
-        
-        # Legal capacity statement
-        capacity_text = """
-        The above-named individual ("Copyright Holder") is the owner or authorized agent of the 
-        copyrighted work described herein and has the legal authority to act on behalf of the 
-        copyright owner in this matter.
-        """
-        story.append(Paragraph(capacity_text, small_style))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== ORIGINAL COPYRIGHTED WORK ==========
-        story.append(Paragraph("II. IDENTIFICATION OF COPYRIGHTED WORK", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        story.append(Paragraph(
-            "The Copyright Holder owns the following original copyrighted work:",
-            body_style
-        ))
-        story.append(Spacer(1, 0.1*inch))
-        
-        original_data = []
-        
-        # Original image with clickable link
-        if report.original_image_url:
-            link_text = create_clickable_link(
-                report.original_image_url, 
-                "View Original Copyrighted Work"
-            )
-            original_data.append(['Original Work URL:', Paragraph(link_text, body_style)])
+        if hasattr(output, 'write'):
+            # Caller's sink: no temp file to write and read back
+            _render_pdf(report, output, generated_at, context)
         else:
-            original_data.append(['Original Work URL:', 'Available upon request'])
-        
-        # Description/Caption
-        if report.image_caption:
-            original_data.append(['Description:', report.image_caption])
-        
-        # Creation date
-        original_data.append(['First Published:', report_date.strftime('%B %d, %Y')])
-        
-        # Copyright registration (if available)
-        if hasattr(report, 'copyright_registration') and report.copyright_registration:
-            original_data.append(['Copyright Reg. #:', report.copyright_registration])
-        
-        original_table = Table(original_data, colWidths=[2*inch, 4*inch])
-        original_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0FDF4')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        story.append(original_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== INFRINGING MATERIAL ==========
-        story.append(Paragraph("III. IDENTIFICATION OF INFRINGING MATERIAL", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        story.append(Paragraph(
-            "The copyrighted work identified above is being used without authorization at the following location:",
-            body_style
-        ))
-        story.append(Spacer(1, 0.1*inch))
-        
-        infringing_data = []
-        
-        # Infringing page URL with clickable link
-        if report.infringing_url:
-            link_text = create_clickable_link(
-                report.infringing_url,
-                "View Infringing Content"
-            )
-            infringing_data.append(['Infringing Page URL:', Paragraph(link_text, body_style)])
+            # Create output path if not provided
+            if not output:
+                output = os.path.join(
+                    tempfile.gettempdir(), 
+                    f"dmca_report_{report.id}_{generated_at.strftime('%Y%m%d_%H%M%S')}.pdf"
+                )
             
-            # Also show truncated URL for reference
-            infringing_data.append(['Domain/Path:', truncate_url_for_display(report.infringing_url, 70)])
-        
-        # Direct image URL (if different from page)
-        if report.suspected_image_url and report.suspected_image_url != report.infringing_url:
-            img_link = create_clickable_link(
-                report.suspected_image_url,
-                "Direct Image Link"
-            )
-            infringing_data.append(['Direct Image URL:', Paragraph(img_link, body_style)])
-        
-        # Screenshot evidence
-        if report.screenshot_url:
-            screenshot_link = create_clickable_link(
-                report.screenshot_url,
-                "View Screenshot Evidence"
+            # Render beside the target and move it into place only once complete,
+            # so a failed render never leaves a truncated PDF at output
+            pdf_file = tempfile.NamedTemporaryFile(
+                'wb', buffering=_PDF_WRITE_BUFFER, dir=os.path.dirname(os.path.abspath(output)),
+                prefix='.dmca_report_', suffix='.pdf.tmp', delete=False
             )
-            infringing_data.append(['Screenshot Evidence:', Paragraph(screenshot_link, body_style)])
-        
-        # Similarity score
-        if report.similarity_score:
-            similarity_pct = float(report.similarity_score) * 100
-            infringing_data.append(['Match Accuracy:', f"{similarity_pct:.1f}% similarity"])
-        
-        # Detection date
-        detect_date = report.detected_at or report.created_at or datetime.utcnow()
-        infringing_data.append(['Detected On:', detect_date.strftime('%B %d, %Y at %I:%M %p UTC')])
-        
-        infringing_table = Table(infringing_data, colWidths=[2*inch, 4*inch])
-        infringing_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#FEF2F2')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        story.append(infringing_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== COMMERCIAL USE (IF DETECTED) ==========
-        if report.is_product:
-            story.append(Paragraph("⚠️ COMMERCIAL USE DETECTED", heading_style))
-            story.append(Spacer(1, 0.1*inch))
-            
-            commercial_text = """
-            <b>IMPORTANT:</b> The infringing content is being used for commercial purposes, 
-            which constitutes a more serious violation of copyright law and may result in 
-            enhanced statutory damages.
-            """
-            story.append(Paragraph(commercial_text, body_style))
-            story.append(Spacer(1, 0.1*inch))
-            
-            commercial_data = []
-            commercial_data.append(['Commercial Use:', 'YES - Content being sold/monetized'])
-            
-            if report.product_price:
-                price_str = f"{report.product_currency or '$'}{report.product_price}"
-                commercial_data.append(['Listed Price:', price_str])
-            
-            if report.marketplace:
-                commercial_data.append(['Platform/Marketplace:', report.marketplace])
-            
-            if report.source_name:
-                commercial_data.append(['Seller/Vendor:', report.source_name])
-            
-            commercial_table = Table(commercial_data, colWidths=[2*inch, 4*inch])
-            commercial_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FFF5F5')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-                ('TOPPADDING', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#EF4444')),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            story.append(commercial_table)
-            story.append(Spacer(1, 0.3*inch))
-        
-        # ========== DETAILED PAGE METADATA ==========
-        if report.page_metadata or report.page_title or report.page_description:
-            story.append(Paragraph("IV. INFRINGING PAGE DETAILS", heading_style))
-            story.append(Spacer(1, 0.1*inch))
-            
-            metadata_data = []
-            
-            # Page title
-            if report.page_title:
-                metadata_data.append(['Page Title:', _wrap_text(report.page_title, 60)])
-            
-            # Website/Source name
-            if report.source_name:
-                metadata_data.append(['Website Name:', report.source_name])
-            
-            # Domain
-            if report.source_domain:
-                metadata_data.append(['Domain:', report.source_domain])
-            
-            # Description
-            if report.page_description:
-                metadata_data.append(['Page Description:', _wrap_text(report.page_description, 80)])
-            
-            # Author/Publisher
-            if report.page_author:
-                metadata_data.append(['Author/Publisher:', report.page_author])
-            
-            # Copyright notice (ironic if present)
-            if report.page_copyright:
-                metadata_data.append(['Their Copyright Notice:', _wrap_text(report.page_copyright, 60)])
-            
-            # Image alt text
-            if report.suspected_image_alt:
-                metadata_data.append(['Image Alt Text:', _wrap_text(report.suspected_image_alt, 60)])
-            
-            # Image title
-            if report.suspected_image_title:
-                metadata_data.append(['Image Title:', _wrap_text(report.suspected_image_title, 60)])
-            
-            # Tags/Keywords
-            if report.page_tags:
-                try:
-                    if isinstance(report.page_tags, list):
-                        tags_str = ', '.join(report.page_tags[:10])
-                    else:
-                        tags_str = str(report.page_tags)
-                    metadata_data.append(['Keywords/Tags:', _wrap_text(tags_str, 70)])
-                except:
-                    pass
-            
-            # Google's identification
-            if report.best_guess:
-                metadata_data.append(['Image Identified As:', report.best_guess])
-            
-            # Search position
-            if report.serp_position:
-                metadata_data.append(['Search Result Position:', f"#{report.serp_position}"])
-            
-            # Technical details
-            if report.image_width and report.image_height:
-                metadata_data.append([
-                    'Image Dimensions:', 
-                    f"{report.image_width} × {report.image_height} pixels"
-                ])
-            
-            if report.image_format:
-                metadata_data.append(['Image Format:', report.image_format.upper()])
-            
-            if metadata_data:
-                metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-                metadata_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#FFFBEB')),
-                    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                story.append(metadata_table)
-            
-            story.append(Spacer(1, 0.3*inch))
-        
-        # ========== LEGAL STATEMENTS ==========
-        story.append(PageBreak())
-        story.append(Paragraph("V. LEGAL STATEMENTS AND DECLARATIONS", heading_style))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Good faith belief
-        story.append(Paragraph("A. Good Faith Belief Statement", subheading_style))
-        good_faith_text = """
-        I have a good faith belief that the use of the copyrighted material described above 
-        in the manner complained of is not authorized by the copyright owner, its agent, or 
-        the law. The use of this material does not fall under fair use, fair dealing, or any 
-        other exception to copyright infringement.
-        """
-        story.append(Paragraph(good_faith_text, body_style))
-        story.append(Spacer(1, 0.15*inch))
-        
-        # Accuracy statement
-        story.append(Paragraph("B. Statement of Accuracy", subheading_style))
-        accuracy_text = """
-        I declare, under penalty of perjury under the laws of the United States of America 
-        and under applicable international treaties, that the information contained in this 
-        notification is accurate. I further declare that I am the copyright owner or am 
-        authorized to act on behalf of the owner of an exclusive right that is allegedly 
-        infringed.
-        """
-        story.append(Paragraph(accuracy_text, body_style))
-        story.append(Spacer(1, 0.15*inch))
-        
-        # Authorization statement
-        story.append(Paragraph("C. Authorization to Act", subheading_style))
-        auth_text = """
-        The undersigned is authorized to act on behalf of the copyright owner and has been 
-        granted full authority to enforce the copyrights in the identified work(s). This 
-        authorization includes the right to submit DMCA takedown notices and pursue legal 
-        remedies for copyright infringement.
-        """
-        story.append(Paragraph(auth_text, body_style))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== REQUIRED ACTIONS ==========
-        story.append(Paragraph("VI. REQUIRED ACTIONS UNDER DMCA", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        actions_text = """
-        Pursuant to the Digital Millennium Copyright Act (17 U.S.C. § 512), you are hereby 
-        required to take the following actions expeditiously:
-        """
-        story.append(Paragraph(actions_text, body_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        # Actions list
-        actions_list = [
-            "Remove or disable access to the infringing material identified in Section III of this notice",
-            "Notify the alleged infringer of the removal or disabling of access to the material",
-            "Provide written confirmation of compliance to the Copyright Holder within 48 hours",
-            "Implement repeat infringer policies in accordance with 17 U.S.C. § 512(i)",
-            "Preserve all evidence related to this infringement for potential legal proceedings"
-        ]
-        
-        for i, action in enumerate(actions_list, 1):
-            story.append(Paragraph(f"<b>{i}.</b> {action}", body_style))
-            story.append(Spacer(1, 0.05*inch))
-        
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Response timeline
-        timeline_text = """
-        <b>Response Timeline:</b> You must respond to this notice within 48 hours. Failure to 
-        comply may result in further legal action, including but not limited to filing a lawsuit 
-        for copyright infringement, seeking statutory damages up to $150,000 per work infringed, 
-        and pursuing injunctive relief.
-        """
-        story.append(Paragraph(timeline_text, body_style))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== LEGAL CONSEQUENCES ==========
-        story.append(Paragraph("VII. LEGAL CONSEQUENCES OF NON-COMPLIANCE", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        consequences_text = """
-        Failure to remove the infringing content may result in:
-        <br/><br/>
-        • <b>Civil Liability:</b> Statutory damages of $750 to $30,000 per work infringed, 
-        or up to $150,000 per work if the infringement is found to be willful<br/>
-        • <b>Injunctive Relief:</b> Court orders to cease all infringing activities<br/>
-        • <b>Attorney Fees:</b> Payment of the Copyright Holder's legal costs and attorney fees<br/>
-        • <b>Loss of Safe Harbor:</b> Forfeiture of DMCA safe harbor protections under 17 U.S.C. § 512<br/>
-        • <b>Criminal Penalties:</b> In cases of willful infringement for commercial advantage, 
-        criminal prosecution under 17 U.S.C. § 506
-        """
-        story.append(Paragraph(consequences_text, body_style))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== CONTACT INFORMATION ==========
-        story.append(Paragraph("VIII. CONTACT INFORMATION", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        story.append(Paragraph("For questions or to provide compliance confirmation, contact:", body_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        contact_data = []
-        
-        if user:
-            # Copyright holder contact
-            if user.full_name or user.username:
-                contact_data.append(['Copyright Holder:', user.full_name or user.username])
-            contact_data.append(['Email:', user.email or "Available upon request"])
-            if hasattr(user, 'phone_number') and user.phone_number:
-                contact_data.append(['Phone:', user.phone_number])
+            try:
+                # One large buffer so the document reaches disk in a few big writes
+                with pdf_file:
+                    _render_pdf(report, pdf_file, generated_at, context)
+                os.replace(pdf_file.name, output)
+            except BaseException:
+                os.unlink(pdf_file.name)
+                raise
         
-        # Sentinel AI DMCA agent
-        contact_data.append(['DMCA Agent:', 'Sentinel AI Legal Department'])
-        contact_data.append(['Agent Email:', 'dmca@sentinelai.com'])
-        contact_data.append(['Agent Phone:', '+1 (555) 123-4567'])
-        contact_data.append(['Website:', 'https://sentinelai.com/dmca'])
-        
-        contact_table = Table(contact_data, colWidths=[2*inch, 4*inch])
-        contact_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F7FAFC')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        story.append(contact_table)
-        story.append(Spacer(1, 0.4*inch))
-        
-        # ========== SIGNATURE SECTION ==========
-        story.append(Paragraph("IX. ELECTRONIC SIGNATURE", heading_style))
-        story.append(Spacer(1, 0.1*inch))
-        
-        signature_text = """
-        By submitting this notice, the Copyright Holder hereby electronically signs this 
-        document and affirms that all statements herein are true and accurate under penalty 
-        of perjury.
-        """
-        story.append(Paragraph(signature_text, body_style))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Signature block
-        sig_data = [
-            ['Signed By:', user.full_name or user.username if user else f"User #{report.user_id}"],
-            ['Date:', datetime.utcnow().strftime('%B %d, %Y')],
-            ['Time:', datetime.utcnow().strftime('%I:%M %p UTC')],
-            ['IP Address:', '[System will log on submission]'],
-            ['Electronic Signature:', '/s/ ' + (user.full_name or user.username if user else "Electronic Signature")]
-        ]
-        
-        sig_table = Table(sig_data, colWidths=[2*inch, 4*inch])
-        sig_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FFFBEB')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        story.append(sig_table)
-        story.append(Spacer(1, 0.5*inch))
-        
-        # ========== FOOTER WITH LEGAL DISCLAIMER ==========
-        story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-        story.append(Spacer(1, 0.15*inch))
-        
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#718096'),
-            alignment=TA_CENTER,
-            leading=10
-        )
-        
-        footer_text = f"""
-        <b>DOCUMENT INFORMATION</b><br/>
-        Report ID: {report.id} | Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}<br/>
-        Match ID: {report.match_id} | User ID: {report.user_id}<br/>
-        <br/>
-        <i>This DMCA Takedown Notice was generated by Sentinel AI's automated copyright protection system.<br/>
-        The system uses advanced image recognition and AI to detect unauthorized use of copyrighted content.<br/>
-        All information has been verified and is accurate as of the date of issuance.</i><br/>
-        <br/>
-        <b>Legal Notice:</b> This document constitutes a formal DMCA takedown notice pursuant to 
-        17 U.S.C. § 512(c)(3)(A).<br/>
-        Willful misrepresentation in a DMCA notice may subject the complaining party to liability 
-        for damages under 17 U.S.C. § 512(f).<br/>
-        <br/>
-        <b>Sentinel AI</b> | Copyright Protection Platform | https://sentinelai.com<br/>
-        For support: support@sentinelai.com | DMCA Agent: dmca@sentinelai.com<br/>
-        <br/>
-        © {datetime.utcnow().year} Sentinel AI. All rights reserved. This document is confidential and legally privileged.
-        """
-        
-        story.append(Paragraph(footer_text, footer_style))
-        
-        # ========== BUILD PDF ==========
-        doc.build(story)
-        
-        logger.info(f"✅ Generated professional DMCA PDF: {output_path}")
+        user = report.user
+        logger.info(f"✅ Generated professional DMCA PDF: {output}")
         logger.info(f"   Report ID: {report.id}")
         logger.info(f"   User: {user.username if user else report.user_id}")
         logger.info(f"   Infringing URL: {report.infringing_url}")
         
-        return output_path
+        return output
         
     except Exception as e:
         logger.exception(f"❌ Failed to generate DMCA PDF for report {report.id}")
         raise
 
 
-def _wrap_text(text: str, max_width: int = 60) -> str:
-    """Wrap text to fit within max width for better readability."""
-    if not text:
-        return "N/A"
-    text = str(text).strip()
-    if len(text) <= max_width:
-        return text
+def generate_dmca_pdf_bytes(
+    report: Any,
+    generated_at: Optional[datetime] = None,
+    context: Optional[dict] = None,
+) -> bytes:
+    """
+    Generate the DMCA takedown notice PDF in memory, without touching disk.
     
-    # Simple word wrapping
-    words = text.split()
-    lines = []
-    current_line = []
-    current_length = 0
+    Args:
+        report: DmcaReports model instance with user relationship loaded,
+            or a DTO dict from _report_to_dto
+        generated_at: Generation timestamp (UTC); defaults to now
+        context: Precomputed format_report_context(report)
+        
+    Returns:
+        The PDF document as bytes, ready to send in an HTTP response
+    """
+    return generate_dmca_pdf(report, BytesIO(), generated_at, context).getvalue()
+
+
+def upload_dmca_pdf(
+    report: Any,
+    generated_at: Optional[datetime] = None,
+    context: Optional[dict] = None,
+    make_presigned: bool = True,
+) -> str:
+    """
+    Render the DMCA notice in memory and stream it to S3, with no temp file.
     
-    for word in words:
-        if current_length + len(word) + 1 <= max_width:
-            current_line.append(word)
-            current_length += len(word) + 1
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-            current_length = len(word)
+    Args:
+        report: DmcaReports model instance with user relationship loaded,
+            or a DTO dict from _report_to_dto
+        generated_at: Generation timestamp (UTC); defaults to now
+        context: Precomputed format_report_context(report)
+        make_presigned: Return a presigned URL (default) instead of the object key
+        
+    Returns:
+        Presigned URL (or S3 key) of the uploaded PDF
+    """
+    # Imported here so rendering PDFs does not require an S3 client
+    from scrapping.uploader import upload_pdf_to_s3
     
-    if current_line:
-        lines.append(' '.join(current_line))
+    if isinstance(report, dict):
+        report = _dto_to_report(report)
     
-    return '\n'.join(lines)
+    buffer = generate_dmca_pdf(report, BytesIO(), generated_at, context)
+    buffer.seek(0)
+    return upload_pdf_to_s3(buffer, report.user_id, f"dmca_report_{report.id}.pdf", make_presigned=make_presigned)
 
 
-def _truncate(text: str, max_length: int) -> str:
-    """Truncate text to max length with ellipsis."""
-    if not text:
-        return "N/A"
-    text = str(text).strip()
-    if len(text) <= max_length:
+def _cell(text: Any, style: ParagraphStyle = _CELL_STYLE, hard_max: int = _CELL_HARD_MAX) -> Any:
+    """Return a table cell for free text: short values as-is, long ones as a truncated, wrapped Paragraph."""
+    text = str(text)
+    if len(text) <= _PLAIN_CELL_MAX:
         return text
-    return text[:max_length - 3] + "..."
+    return Paragraph(escape(_truncate(text, hard_max)), style)
 
 
-# ========== HTML PREVIEW GENERATOR ==========
-def generate_dmca_html_preview(report: Any) -> str:
-    """
-    Generate HTML preview of DMCA report for web display.
+def _report_info_rows(report: Any, ctx: dict) -> list:
+    return [
+        ['Report ID:', f"#{report.id}"],
+        ['Issue Date:', f"{ctx['issue_date']} at {ctx['issue_time']}"],
+        ['Status:', ctx['status']],
+        ['Detection Method:', 'Automated Image Recognition System'],
+    ]
+
+
+_ADDRESS_FIELDS = ('street_address', 'city', 'state', 'zip_code', 'country')
+
+
+def _holder_rows(report: Any, ctx: dict) -> list:
+    user = report.user
+    if not user:
+        return [
+            ['Copyright Holder:', f"User ID #{report.user_id}"],
+            ['Email Address:', "Available upon request"],
+        ]
+    
+    # Full name or username, email (required)
+    user_data = [
+        ['Full Legal Name:', user.full_name or user.username or "Not Provided"],
+        ['Email Address:', user.email or "Not Provided"],
+    ]
+    
+    # Phone (if available)
+    phone = getattr(user, 'phone_number', None)
+    if phone:
+        user_data.append(['Phone Number:', phone])
+    
+    # Address (if available): a single address field, else assembled from parts when a city is known
+    address = getattr(user, 'address', None)
+    if not address and getattr(user, 'city', None):
+        address = ', '.join(filter(None, (getattr(user, field, None) for field in _ADDRESS_FIELDS)))
+    if address:
+        user_data.append(['Mailing Address:', _cell(address)])
+    
+    # User ID (for reference)
+    user_data.append(['User ID:', f"#{user.id}"])
+    return user_data
+
+
+def _original_rows(report: Any, ctx: dict) -> list:
+    # Original image with clickable link
+    if report.original_image_url:
+        link_text = create_clickable_link(report.original_image_url, "View Original Copyrighted Work")
+        original_data = [['Original Work URL:', Paragraph(link_text, _BODY_STYLE)]]
+    else:
+        original_data = [['Original Work URL:', 'Available upon request']]
+    
+    # Description/Caption
+    if report.image_caption:
+        original_data.append(['Description:', _cell(report.image_caption)])
+    
+    # Creation date
+    original_data.append(['First Published:', ctx['issue_date']])
+    
+    # Copyright registration (if available)
+    registration = getattr(report, 'copyright_registration', None)
+    if registration:
+        original_data.append(['Copyright Reg. #:', _cell(registration)])
+    
+    return original_data
+
+
+def _infringing_rows(report: Any, ctx: dict) -> list:
+    infringing_data = []
+    
+    # Infringing page URL with clickable link, plus truncated URL for reference
+    if report.infringing_url:
+        link_text = create_clickable_link(report.infringing_url, "View Infringing Content")
+        infringing_data.append(['Infringing Page URL:', Paragraph(link_text, _BODY_STYLE)])
+        infringing_data.append(['Domain/Path:', truncate_url_for_display(report.infringing_url, 70)])
+    
+    # Direct image URL (if different from page)
+    if report.suspected_image_url and report.suspected_image_url != report.infringing_url:
+        img_link = create_clickable_link(report.suspected_image_url, "Direct Image Link")
+        infringing_data.append(['Direct Image URL:', Paragraph(img_link, _BODY_STYLE)])
+    
+    # Screenshot evidence
+    if report.screenshot_url:
+        screenshot_link = create_clickable_link(report.screenshot_url, "View Screenshot Evidence")
+        infringing_data.append(['Screenshot Evidence:', Paragraph(screenshot_link, _BODY_STYLE)])
+    
+    # Similarity score
+    if ctx['similarity_pct']:
+        infringing_data.append(['Match Accuracy:', f"{ctx['similarity_pct']} similarity"])
+    
+    # Detection date
+    detect_date = ctx['detected_at'] or ctx['generated_at']
+    infringing_data.append(['Detected On:', detect_date.strftime('%B %d, %Y at %I:%M %p UTC')])
+    return infringing_data
+
+
+def _commercial_rows(report: Any, ctx: dict) -> Optional[list]:
+    if not report.is_product:
+        return None
+    
+    commercial_data = [['Commercial Use:', 'YES - Content being sold/monetized']]
+    if report.product_price:
+        commercial_data.append(['Listed Price:', f"{report.product_currency or '$'}{report.product_price}"])
+    if report.marketplace:
+        commercial_data.append(['Platform/Marketplace:', _cell(report.marketplace)])
+    if report.source_name:
+        commercial_data.append(['Seller/Vendor:', _cell(report.source_name)])
+    return commercial_data
+
+
+def _metadata_rows(report: Any, ctx: dict) -> Optional[list]:
+    if not (report.page_metadata or report.page_title or report.page_description):
+        return None
+    
+    metadata_data = []
+    for label, field, wrap_width in _METADATA_FIELDS:
+        value = field(report) if callable(field) else getattr(report, field, None)
+        if not value:
+            continue
+        if wrap_width:
+            value = _wrap_text(_truncate(value, _CELL_HARD_MAX), wrap_width)
+        else:
+            value = _cell(value, _METADATA_CELL_STYLE)
+        metadata_data.append([label, value])
+    return metadata_data
+
+
+def _contact_rows(report: Any, ctx: dict) -> list:
+    contact_data = []
     
-    Args:
-        report: DmcaReports model instance
-        
-    Returns:
-        HTML string
-    """
     user = report.user
-    user_name = user.full_name or user.username if user else f"User #{report.user_id}"
+    if user:
+        # Copyright holder contact
+        if ctx['user_name']:
+            contact_data.append(['Copyright Holder:', ctx['user_name']])
+        contact_data.append(['Email:', user.email or "Available upon request"])
+        phone = getattr(user, 'phone_number', None)
+        if phone:
+            contact_data.append(['Phone:', phone])
     
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>DMCA Report #{report.id}</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 20px;
-            }}
-            .container {{
-                max-width: 900px;
-                margin: 0 auto;
-                background: white;
-                border-radius: 12px;
-                box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-                overflow: hidden;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #2c5282 0%, #2b6cb0 100%);
-                color: white;
-                padding: 40px 30px;
-                text-align: center;
-            }}
-            .header h1 {{
-                font-size: 28px;
-                margin-bottom: 10px;
-                font-weight: 700;
-            }}
-            .header p {{
-                font-size: 14px;
-                opacity: 0.9;
-            }}
-            .report-id {{
-                background: rgba(255,255,255,0.2);
-                display: inline-block;
-                padding: 8px 20px;
-                border-radius: 20px;
-                margin-top: 15px;
-                font-weight: 600;
-            }}
-            .content {{
-                padding: 30px;
-            }}
-            .section {{
-                background: #f8f9fa;
-                padding: 25px;
-                margin-bottom: 20px;
-                border-radius: 8px;
-                border-left: 4px solid #2c5282;
-            }}
-            .section h2 {{
-                color: #2c5282;
-                font-size: 18px;
-                margin-bottom: 15px;
-                padding-bottom: 10px;
-                border-bottom: 2px solid #e2e8f0;
-            }}
-            .info-grid {{
-                display: grid;
-                gap: 12px;
-            }}
-            .info-row {{
-                display: grid;
-                grid-template-columns: 150px 1fr;
-                padding: 12px;
-                background: white;
-                border-radius: 6px;
-                border: 1px solid #e2e8f0;
-            }}
-            .info-label {{
-                font-weight: 600;
-                color: #4a5568;
-            }}
-            .info-value {{
-                color: #2d3748;
-                word-break: break-word;
-            }}
-            .info-value a {{
-                color: #2b6cb0;
-                text-decoration: none;
-                font-weight: 500;
-            }}
-            .info-value a:hover {{
-                text-decoration: underline;
-            }}
-            .alert {{
-                background: #fff5f5;
-                border: 2px solid #fc8181;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-            }}
-            .alert h3 {{
-                color: #c53030;
-                margin-bottom: 10px;
-                font-size: 16px;
-            }}
-            .badge {{
-                display: inline-block;
-                padding: 4px 12px;
-                border-radius: 12px;
-                font-size: 12px;
-                font-weight: 600;
-                text-transform: uppercase;
-            }}
-            .badge-success {{
-                background: #c6f6d5;
-                color: #22543d;
-            }}
-            .badge-warning {{
-                background: #feebc8;
-                color: #744210;
-            }}
-            .badge-danger {{
-                background: #fed7d7;
-                color: #742a2a;
-            }}
-            .footer {{
-                background: #2d3748;
-                color: #cbd5e0;
-                padding: 25px;
-                text-align: center;
-                font-size: 13px;
-            }}
-            .footer a {{
-                color: #90cdf4;
-                text-decoration: none;
-            }}
-            @media (max-width: 768px) {{
-                .info-row {{
-                    grid-template-columns: 1fr;
-                    gap: 5px;
-                }}
-                .content {{
-                    padding: 20px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>⚖️ DMCA TAKEDOWN NOTICE</h1>
-                <p>Digital Millennium Copyright Act - 17 U.S.C. § 512(c)(3)</p>
-                <div class="report-id">Report ID: #{report.id}</div>
-            </div>
-            
-            <div class="content">
-                <!-- Status Badge -->
-                <div style="text-align: center; margin-bottom: 20px;">
-                    <span class="badge {'badge-success' if report.status == 'sent' else 'badge-warning'}">
-                        Status: {(report.status or 'pending').upper()}
-                    </span>
-                </div>
-                
-                <!-- Copyright Holder -->
-                <div class="section">
-                    <h2>📋 Copyright Holder Information</h2>
-                    <div class="info-grid">
-                        <div class="info-row">
-                            <div class="info-label">Name:</div>
-                            <div class="info-value">{user_name}</div>
-                        </div>
-                        {f'''<div class="info-row">
-                            <div class="info-label">Email:</div>
-                            <div class="info-value"><a href="mailto:{user.email}">{user.email}</a></div>
-                        </div>''' if user and user.email else ''}
-                        {f'''<div class="info-row">
-                            <div class="info-label">Phone:</div>
-                            <div class="info-value">{user.phone_number}</div>
-                        </div>''' if user and hasattr(user, 'phone_number') and user.phone_number else ''}
-                        <div class="info-row">
-                            <div class="info-label">User ID:</div>
-                            <div class="info-value">#{report.user_id}</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Original Work -->
-                <div class="section">
-                    <h2>🎨 Original Copyrighted Work</h2>
-                    <div class="info-grid">
-                        <div class="info-row">
-                            <div class="info-label">Original URL:</div>
-                            <div class="info-value">
-                                <a href="{report.original_image_url or '#'}" target="_blank">
-                                    View Original Work →
-                                </a>
-                            </div>
-                        </div>
-                        {f'''<div class="info-row">
-                            <div class="info-label">Description:</div>
-                            <div class="info-value">{report.image_caption}</div>
-                        </div>''' if report.image_caption else ''}
-                        <div class="info-row">
-                            <div class="info-label">Created:</div>
-                            <div class="info-value">{report.created_at.strftime('%B %d, %Y') if report.created_at else 'N/A'}</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Infringing Content -->
-                <div class="section">
-                    <h2>⚠️ Infringing Content Location</h2>
-                    <div class="info-grid">
-                        <div class="info-row">
-                            <div class="info-label">Infringing URL:</div>
-                            <div class="info-value">
-                                <a href="{report.infringing_url or '#'}" target="_blank">
-                                    View Infringing Content →
-                                </a>
-                            </div>
-                        </div>
-                        {f'''<div class="info-row">
-                            <div class="info-label">Domain:</div>
-                            <div class="info-value">{report.source_domain}</div>
-                        </div>''' if report.source_domain else ''}
-                        {f'''<div class="info-row">
-                            <div class="info-label">Website:</div>
-                            <div class="info-value">{report.source_name}</div>
-                        </div>''' if report.source_name else ''}
-                        <div class="info-row">
-                            <div class="info-label">Match Accuracy:</div>
-                            <div class="info-value">{float(report.similarity_score or 0) * 100:.1f}% similarity</div>
-                        </div>
-                        <div class="info-row">
-                            <div class="info-label">Detected:</div>
-                            <div class="info-value">{(report.detected_at or report.created_at).strftime('%B %d, %Y at %I:%M %p UTC') if report.detected_at or report.created_at else 'N/A'}</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Commercial Use Alert -->
-                {f'''<div class="alert">
-                    <h3>🚨 COMMERCIAL USE DETECTED</h3>
-                    <p>The infringing content is being used for commercial purposes, which constitutes a more serious violation.</p>
-                    <div class="info-grid" style="margin-top: 15px;">
-                        <div class="info-row">
-                            <div class="info-label">Commercial Use:</div>
-                            <div class="info-value"><strong>YES - Content being sold</strong></div>
-                        </div>
-                        {f"""<div class="info-row">
-                            <div class="info-label">Listed Price:</div>
-                            <div class="info-value">{report.product_currency or '$'}{report.product_price}</div>
-                        </div>""" if report.product_price else ''}
-                        {f"""<div class="info-row">
-                            <div class="info-label">Platform:</div>
-                            <div class="info-value">{report.marketplace}</div>
-                        </div>""" if report.marketplace else ''}
-                    </div>
-                </div>''' if report.is_product else ''}
-                
-                <!-- Page Details -->
-                {f'''<div class="section">
-                    <h2>📄 Page Metadata</h2>
-                    <div class="info-grid">
-                        {f"""<div class="info-row">
-                            <div class="info-label">Page Title:</div>
-                            <div class="info-value">{report.page_title}</div>
-                        </div>""" if report.page_title else ''}
-                        {f"""<div class="info-row">
-                            <div class="info-label">Description:</div>
-                            <div class="info-value">{report.page_description[:200]}...</div>
-                        </div>""" if report.page_description else ''}
-                        {f"""<div class="info-row">
-                            <div class="info-label">Author:</div>
-                            <div class="info-value">{report.page_author}</div>
-                        </div>""" if report.page_author else ''}
-                        {f"""<div class="info-row">
-                            <div class="info-label">Image Alt:</div>
-                            <div class="info-value">{report.suspected_image_alt}</div>
-                        </div>""" if report.suspected_image_alt else ''}
-                    </div>
-                </div>''' if report.page_title or report.page_description else ''}
-                
-                <!-- Legal Statements -->
-                <div class="section">
-                    <h2>⚖️ Legal Declarations</h2>
-                    <p style="margin-bottom: 15px;">
-                        <strong>Good Faith Belief:</strong> I have a good faith belief that the use of the copyrighted 
-                        materials described above is not authorized by the copyright owner, its agent, or the law.
-                    </p>
-                    <p>
-                        <strong>Penalty of Perjury:</strong> I swear, under penalty of perjury, that the information 
-                        in this notification is accurate and that I am the copyright owner or authorized to act on 
-                        behalf of the owner.
-                    </p>
-                </div>
-                
-                <!-- Required Actions -->
-                <div class="section">
-                    <h2>📋 Required Actions</h2>
-                    <p style="margin-bottom: 10px;"><strong>You must:</strong></p>
-                    <ol style="margin-left: 20px; color: #2d3748;">
-                        <li>Remove or disable access to the infringing material immediately</li>
-                        <li>Provide written confirmation of removal within 48 hours</li>
-                        <li>Notify the alleged infringer of this takedown notice</li>
-                        <li>Preserve all evidence for potential legal proceedings</li>
-                    </ol>
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p><strong>Generated by Sentinel AI</strong> | {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-                <p style="margin-top: 10px;">
-                    Report ID: {report.id} | Match ID: {report.match_id}<br/>
-                    This document is issued under the DMCA, 17 U.S.C. § 512(c)(3)
-                </p>
-                <p style="margin-top: 15px;">
-                    <a href="https://sentinelai.com">sentinelai.com</a> | 
-                    <a href="mailto:dmca@sentinelai.com">dmca@sentinelai.com</a> | 
-                    <a href="mailto:support@sentinelai.com">support@sentinelai.com</a>
-                </p>
-            </div>
-        </div>
-    </body>
-    </html>
+    # Sentinel AI DMCA agent
+    contact_data.extend(_AGENT_CONTACT_ROWS)
+    return contact_data
+
+
+def _signature_rows(report: Any, ctx: dict) -> list:
+    signer = ctx['user_name']
+    return [
+        ['Signed By:', signer or f"User #{report.user_id}"],
+        ['Date:', ctx['generated_date']],
+        ['Time:', ctx['generated_time']],
+        ['IP Address:', '[System will log on submission]'],
+        ['Electronic Signature:', '/s/ ' + (signer or "Electronic Signature")],
+    ]
+
+
+def _section_flowables(heading: Optional[Paragraph], intro: Optional[Paragraph], rows: list,
+                       table_style: TableStyle, outro: Optional[Paragraph], space_after: Spacer) -> Iterator:
+    """Yield heading -> intro -> key/value table -> outro -> spacer; any part may be absent."""
+    if heading is not None:
+        yield copy(heading)
+        yield copy(_SPACER_XS)
+    if intro is not None:
+        yield copy(intro)
+        yield copy(_SPACER_XS)
+    for start in range(0, len(rows or ()), _TABLE_CHUNK_ROWS):
+        if start:
+            yield Spacer(1, 0)
+        table = Table(rows[start:start + _TABLE_CHUNK_ROWS], colWidths=[_COL_LABEL, _COL_VALUE])
+        table.setStyle(table_style)
+        yield table
+    if outro is not None:
+        yield copy(_SPACER_XS)
+        yield copy(outro)
+    yield copy(space_after)
+
+
+# Sections V-VII are identical in every notice: the whole run of headings, fixed
+# paragraphs and spacers is parsed once and copied into each story.
+_LEGAL_STATEMENT_FLOWABLES = (
+    PageBreak(),
+    Paragraph("V. LEGAL STATEMENTS AND DECLARATIONS", _HEADING_STYLE),
+    _SPACER_MD,
+    
+    Paragraph("A. Good Faith Belief Statement", _SUBHEADING_STYLE),
+    _GOOD_FAITH_PARA,
+    _SPACER_SM,
+    
+    Paragraph("B. Statement of Accuracy", _SUBHEADING_STYLE),
+    _ACCURACY_PARA,
+    _SPACER_SM,
+    
+    Paragraph("C. Authorization to Act", _SUBHEADING_STYLE),
+    _AUTHORIZATION_PARA,
+    _SPACER_LG,
+    
+    Paragraph("VI. REQUIRED ACTIONS UNDER DMCA", _HEADING_STYLE),
+    _SPACER_XS,
+    _ACTIONS_INTRO_PARA,
+    _SPACER_XS,
+    *_ACTION_PARAS,
+    _SPACER_MD,
+    _TIMELINE_PARA,
+    _SPACER_LG,
+    
+    Paragraph("VII. LEGAL CONSEQUENCES OF NON-COMPLIANCE", _HEADING_STYLE),
+    _SPACER_XS,
+    _CONSEQUENCES_PARA,
+    _SPACER_LG,
+)
+
+
+_HEADER_FLOWABLES = (
+    _SPACER_MD,
+    Paragraph("DMCA TAKEDOWN NOTICE", _TITLE_STYLE),
+    Paragraph("Digital Millennium Copyright Act - 17 U.S.C. § 512(c)(3)", _SMALL_STYLE),
+    HRFlowable(width="100%", thickness=2, color=_COLOR_BRAND),
+    _SPACER_LG,
+)
+
+
+# Table sections in document order, split around the fixed legal statements:
+# (heading, intro, row builder, table style, outro, trailing spacer). Headings are
+# prebuilt Paragraphs, copied per report like the fixed legal text.
+# A builder returning None omits its section entirely.
+_EVIDENCE_SECTIONS = (
+    (None, None, _report_info_rows, _REPORT_INFO_TABLE_STYLE, None, _SPACER_LG),
+    (Paragraph("I. COPYRIGHT HOLDER INFORMATION", _HEADING_STYLE), None, _holder_rows, _USER_TABLE_STYLE, _CAPACITY_PARA, _SPACER_LG),
+    (Paragraph("II. IDENTIFICATION OF COPYRIGHTED WORK", _HEADING_STYLE), _ORIGINAL_INTRO_PARA, _original_rows, _ORIGINAL_TABLE_STYLE, None, _SPACER_LG),
+    (Paragraph("III. IDENTIFICATION OF INFRINGING MATERIAL", _HEADING_STYLE), _INFRINGING_INTRO_PARA, _infringing_rows, _INFRINGING_TABLE_STYLE, None, _SPACER_LG),
+    (Paragraph("⚠️ COMMERCIAL USE DETECTED", _HEADING_STYLE), _COMMERCIAL_PARA, _commercial_rows, _COMMERCIAL_TABLE_STYLE, None, _SPACER_LG),
+    (Paragraph("IV. INFRINGING PAGE DETAILS", _HEADING_STYLE), None, _metadata_rows, _METADATA_TABLE_STYLE, None, _SPACER_LG),
+)
+_CLOSING_SECTIONS = (
+    (Paragraph("VIII. CONTACT INFORMATION", _HEADING_STYLE), _CONTACT_INTRO_PARA, _contact_rows, _CONTACT_TABLE_STYLE, None, _SPACER_XL),
+    (Paragraph("IX. ELECTRONIC SIGNATURE", _HEADING_STYLE), _SIGNATURE_PARA, _signature_rows, _SIGNATURE_TABLE_STYLE, None, _SPACER_XXL),
+)
+
+
+def _sections_flowables(sections: tuple, report: Any, ctx: dict) -> Iterator:
+    for heading, intro, build_rows, table_style, outro, space_after in sections:
+        rows = build_rows(report, ctx)
+        if rows is not None:
+            yield from _section_flowables(heading, intro, rows, table_style, outro, space_after)
+
+
+# Footer markup; only the IDs and timestamps vary per report
+_FOOTER_TEMPLATE = """
+    <b>DOCUMENT INFORMATION</b><br/>
+    Report ID: {report_id} | Generated: {generated}<br/>
+    Match ID: {match_id} | User ID: {user_id}<br/>
+    <br/>
+    <i>This DMCA Takedown Notice was generated by Sentinel AI's automated copyright protection system.<br/>
+    The system uses advanced image recognition and AI to detect unauthorized use of copyrighted content.<br/>
+    All information has been verified and is accurate as of the date of issuance.</i><br/>
+    <br/>
+    <b>Legal Notice:</b> This document constitutes a formal DMCA takedown notice pursuant to 
+    17 U.S.C. § 512(c)(3)(A).<br/>
+    Willful misrepresentation in a DMCA notice may subject the complaining party to liability 
+    for damages under 17 U.S.C. § 512(f).<br/>
+    <br/>
+    <b>Sentinel AI</b> | Copyright Protection Platform | https://sentinelai.com<br/>
+    For support: support@sentinelai.com | DMCA Agent: dmca@sentinelai.com<br/>
+    <br/>
+    © {year} Sentinel AI. All rights reserved. This document is confidential and legally privileged.
     """
-    return html
\ No newline at end of file
+
+
+def _timestamp_context(report: Any, generated_at: datetime) -> dict:
+    """Format the generation and issue timestamps once; several sections print each of them."""
+    generated_date = _long_date(generated_at.date())
+    generated_time = generated_at.strftime('%I:%M %p UTC')
+    issued_at = report.created_at
+    return {
+        'generated_at': generated_at,
+        'generated_date': generated_date,
+        'generated_time': generated_time,
+        'generated_stamp': generated_at.strftime('%Y-%m-%d %H:%M:%S UTC'),
+        'issue_date': _long_date(issued_at.date()) if issued_at else generated_date,
+        'issue_time': issued_at.strftime('%I:%M %p UTC') if issued_at else generated_time,
+    }
+
+
+def _story_flowables(report: Any, ctx: dict) -> Iterator:
+    """Yield the whole notice in document order: header, evidence, legal text, closing, footer."""
+    # ========== HEADER WITH LOGO/BRANDING ==========
+    yield from map(copy, _HEADER_FLOWABLES)
+    
+    # Bare reports (no user, page metadata or listing) come out compact on their own:
+    # the commercial and metadata builders return None and omit their sections, while
+    # holder and contact information, required by 17 U.S.C. 512(c)(3)(A)(iv), stay.
+    yield from _sections_flowables(_EVIDENCE_SECTIONS, report, ctx)
+    # Sections V-VII
+    yield from map(copy, _LEGAL_STATEMENT_FLOWABLES)
+    yield from _sections_flowables(_CLOSING_SECTIONS, report, ctx)
+    
+    # ========== FOOTER WITH LEGAL DISCLAIMER ==========
+    footer_text = _FOOTER_TEMPLATE.format_map({
+        'report_id': report.id,
+        'generated': ctx['generated_stamp'],
+        'match_id': report.match_id,
+        'user_id': report.user_id,
+        'year': ctx['generated_at'].year,
+    })
+    yield HRFlowable(width="100%", thickness=1, color=colors.grey)
+    yield copy(_SPACER_SM)
+    yield Paragraph(footer_text, _FOOTER_STYLE)
+
+
+def _render_pdf(report: Any, output: Any, generated_at: datetime, context: Optional[dict] = None) -> None:
+    """Lay out the notice and write it to output (a file path or binary file-like object)."""
+    ctx = {**(context or format_report_context(report)), **_timestamp_context(report, generated_at)}
+    
+    # Create PDF document with proper margins for legal documents
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=letter,
+        rightMargin=_PAGE_MARGIN,
+        leftMargin=_PAGE_MARGIN,
+        topMargin=_PAGE_MARGIN_VERTICAL,
+        bottomMargin=_PAGE_MARGIN_VERTICAL,
+    )
+    
+    # ========== BUILD PDF ==========
+    # build() consumes the list from the front, so each flowable is released once laid out
+    doc.build(list(_story_flowables(report, ctx)))
+
+
+def _wrap_text(text: str, max_width: int = 60) -> str:
+    """Wrap text to fit within max width for better readability."""
+    if not text:
+        return "N/A"
+    return _wrap_text_cached(text if isinstance(text, str) else str(text), max_width)
+
+
+@lru_cache(maxsize=2048)
+def _wrap_text_cached(text: str, max_width: int) -> str:
+    # Detections on the same page repeat its title/description/tags across a batch
+    text = text.strip()
+    if len(text) <= max_width:
+        return text
+    
+    return '\n'.join(_text_wrapper(max_width).wrap(text))
+
+
+@lru_cache(maxsize=None)
+def _text_wrapper(max_width: int) -> textwrap.TextWrapper:
+    # One TextWrapper per width (only a handful are used) instead of one per textwrap.wrap() call
+    return textwrap.TextWrapper(width=max_width, break_long_words=False)
@@ -1,13 +1,111 @@
 # ip_service/services/dmca_service.py
 import logging
 import uuid
+from itertools import groupby
+from operator import attrgetter
+import orjson
+import zstandard
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
-from ip_service.models.ip_models import DmcaReports, IpMatches, Images, IpAssets
+from common.config.config import settings
+from common.utils.serialization import orjson_default
+from ip_service.models.ip_models import DmcaReports, DmcaReportRaw, IpMatches, Images, IpAssets
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+
+def _match_sources_query(match_ids):
+    """Match IDs with their source image URL and matched asset, in one outer-joined round-trip."""
+    return (
+        select(IpMatches.id, Images.s3_path, IpAssets.id, IpAssets.title)
+        .outerjoin(Images, Images.id == IpMatches.source_image_id)
+        .outerjoin(IpAssets, IpAssets.id == IpMatches.matched_asset_id)
+        .where(IpMatches.id.in_(match_ids))
+    )
+
+
+def _report_values(
+    user_id: int,
+    match_id: int,
+    scraped_data: Dict[str, Any],
+    group_id: Optional[str],
+    original_image_url: Optional[str],
+    asset_id: Optional[int],
+    asset_title: Optional[str],
+    now: datetime
+) -> Dict[str, Any]:
+    """Column values for one DmcaReports row, built from the scraped data and its match's sources."""
+    values = dict(
+        user_id=user_id,
+        match_id=match_id,
+        
+        # Grouping (infringement_group_id is added below only when given)
+        original_asset_id=asset_id,
+        
+        # TIER 1: Critical URLs
+        infringing_url=scraped_data.get("page_url") or scraped_data.get("url", "Unknown"),
+        suspected_image_url=scraped_data.get("suspected_image_url") or scraped_data.get("url"),
+        original_image_url=original_image_url,
+        thumbnail_url=scraped_data.get("thumbnail_url") or scraped_data.get("thumbnail"),
+        screenshot_url=f"https://s3.amazonaws.com/sentinelai-dmca/screenshots/{match_id}.jpg",
+        
+        # Source Attribution
+        source_domain=scraped_data.get("source_domain"),
+        source_name=scraped_data.get("source_name"),
+        page_title=scraped_data.get("page_title") or scraped_data.get("title"),
+        
+        # Commercial Detection
+        is_product=scraped_data.get("is_product", False),
+        product_price=scraped_data.get("product_price"),
+        product_currency=scraped_data.get("product_currency"),
+        marketplace=scraped_data.get("marketplace"),
+        
+        # Similarity & Position
+        similarity_score=scraped_data.get("similarity_score") or scraped_data.get("similarity", 0.0),
+        serp_position=scraped_data.get("serp_position") or scraped_data.get("position"),
+        
+        # TIER 2: Context
+        page_description=scraped_data.get("page_description"),
+        page_snippet=scraped_data.get("page_snippet"),
+        page_author=scraped_data.get("page_author"),
+        page_tags=scraped_data.get("page_tags"),
+        source_logo=scraped_data.get("source_logo"),
+        best_guess=scraped_data.get("best_guess"),
+        
+        # Image Details
+        image_width=scraped_data.get("image_width"),
+        image_height=scraped_data.get("image_height"),
+        image_format=scraped_data.get("image_format"),
+        
+        # Legacy fields
+        image_caption=scraped_data.get("caption") or asset_title if asset_id is not None else None,
+        
+        # Status & Timestamps
+        status="pending",
+        created_at=now,
+        updated_at=now,
+        detected_at=now
+    )
+    # Without a group ID the column is left out so Postgres generates one (gen_random_uuid())
+    if group_id:
+        values["infringement_group_id"] = group_id
+    return values
+
+
+def _raw_payload(scraped_data: Dict[str, Any]) -> bytes:
+    """The raw SerpAPI payload as zstd-compressed orjson, for dmca_reports_raw."""
+    raw = scraped_data.get("raw_serp_data") or scraped_data
+    return zstandard.compress(orjson.dumps(raw, default=orjson_default), 3)
+
+
+def get_raw_serp_data(db: Session, report: DmcaReports) -> Optional[Any]:
+    """Load a report's raw SerpAPI payload, falling back to the legacy JSON column."""
+    payload = db.scalar(select(DmcaReportRaw.payload).where(DmcaReportRaw.report_id == report.id))
+    if payload is None:
+        return report.raw_serp_data
+    return orjson.loads(zstandard.decompress(payload))
 
 
 def create_dmca_report(
@@ -15,7 +113,8 @@ def create_dmca_report(
     user_id: int, 
     match_id: int,
     scraped_data: Dict[str, Any],
-    group_id: Optional[str] = None
+    group_id: Optional[str] = None,
+    commit: bool = True
 ) -> DmcaReports:
     """
     Create a comprehensive DMCA takedown report with all scraped data.
@@ -26,109 +125,136 @@ def create_dmca_report(
         match_id: ID of the IP match
         scraped_data: Complete scraped data from SerpAPI
         group_id: Optional group ID to link related infringements
+        commit: Commit immediately; pass False to flush into the caller's transaction
         
     Returns:
-        Created DmcaReports object
+        Created DmcaReports object (not attached to the session)
     """
     try:
-        # Verify match exists
-        match = db.query(IpMatches).filter(IpMatches.id == match_id).first()
-        if not match:
+        # Verify match exists and fetch its source image and matched asset together
+        sources = db.execute(_match_sources_query([match_id])).first()
+        if not sources:
             raise ValueError(f"Match not found: {match_id}")
-
-        # Get source image and matched asset
-        source_image = db.query(Images).filter(Images.id == match.source_image_id).first()
-        matched_asset = db.query(IpAssets).filter(IpAssets.id == match.matched_asset_id).first()
-        
-        # Generate group ID if not provided (for grouping multiple infringements)
-        if not group_id:
-            group_id = str(uuid.uuid4())
-        
-        # Extract all important fields from scraped_data
-        infringing_url = scraped_data.get("page_url") or scraped_data.get("url", "Unknown")
-        suspected_image_url = scraped_data.get("suspected_image_url") or scraped_data.get("url")
-        thumbnail_url = scraped_data.get("thumbnail_url") or scraped_data.get("thumbnail")
-        
-        # Get original image URL
-        original_image_url = source_image.s3_path if source_image else None
-        
-        # Create comprehensive DMCA report
-        report = DmcaReports(
-            user_id=user_id,
-            match_id=match_id,
-            
-            # Grouping
-            original_asset_id=matched_asset.id if matched_asset else None,
-            infringement_group_id=group_id,
-            
-            # TIER 1: Critical URLs
-            infringing_url=infringing_url,
-            suspected_image_url=suspected_image_url,
-            original_image_url=original_image_url,
-            thumbnail_url=thumbnail_url,
-            screenshot_url=f"https://s3.amazonaws.com/sentinelai-dmca/screenshots/{match_id}.jpg",
-            
-            # Source Attribution
-            source_domain=scraped_data.get("source_domain"),
-            source_name=scraped_data.get("source_name"),
-            page_title=scraped_data.get("page_title") or scraped_data.get("title"),
-            
-            # Commercial Detection
-            is_product=scraped_data.get("is_product", False),
-            product_price=scraped_data.get("product_price"),
-            product_currency=scraped_data.get("product_currency"),
-            marketplace=scraped_data.get("marketplace"),
-            
-            # Similarity & Position
-            similarity_score=scraped_data.get("similarity_score") or scraped_data.get("similarity", 0.0),
-            serp_position=scraped_data.get("serp_position") or scraped_data.get("position"),
-            
-            # TIER 2: Context
-            page_description=scraped_data.get("page_description"),
-            page_snippet=scraped_data.get("page_snippet"),
-            page_author=scraped_data.get("page_author"),
-            page_tags=scraped_data.get("page_tags"),
-            source_logo=scraped_data.get("source_logo"),
-            best_guess=scraped_data.get("best_guess"),
-            
-            # Image Details
-            image_width=scraped_data.get("image_width"),
-            image_height=scraped_data.get("image_height"),
-            image_format=scraped_data.get("image_format"),
-            
-            # TIER 3: Raw Data (for future use)
-            raw_serp_data=scraped_data.get("raw_serp_data") or scraped_data,
-            
-            # Legacy fields
-            image_caption=scraped_data.get("caption") or matched_asset.title if matched_asset else None,
-            
-            # Status & Timestamps
-            status="pending",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            detected_at=datetime.utcnow()
+        _, original_image_url, asset_id, asset_title = sources
+        
+        # Create comprehensive DMCA report; only the server-generated columns come back
+        values = _report_values(
+            user_id, match_id, scraped_data, group_id,
+            original_image_url, asset_id, asset_title, datetime.utcnow()
         )
+        report_id, values["infringement_group_id"] = db.execute(
+            insert(DmcaReports).values(**values)
+            .returning(DmcaReports.id, DmcaReports.infringement_group_id)
+        ).one()
+        report = DmcaReports(id=report_id, **values)
         
-        db.add(report)
-        db.commit()
-        db.refresh(report)
+        if settings.DMCA_STORE_RAW_SERP:
+            db.execute(insert(DmcaReportRaw).values(report_id=report_id, payload=_raw_payload(scraped_data)))
+        if commit:
+            db.commit()
         
         logger.info(
-            f"✅ Created comprehensive DMCA report id={report.id} for user_id={user_id}, "
-            f"match_id={match_id}, infringing_url={infringing_url[:50]}..."
+            "✅ Created comprehensive DMCA report id=%s for user_id=%s, match_id=%s, infringing_url=%.50s...",
+            report_id, user_id, match_id, report.infringing_url
         )
         
         return report
         
     except ValueError as ve:
-        logger.error(f"❌ Validation error creating DMCA report: {ve}")
+        logger.error("❌ Validation error creating DMCA report: %s", ve)
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.exception("❌ Failed to create DMCA report for user %s, match %s", user_id, match_id)
+        raise
+
+
+def create_dmca_reports_bulk(
+    db: Session,
+    items: List[Tuple[int, int, Dict[str, Any]]],
+    group_id: Optional[str] = None,
+    commit: bool = True
+) -> List[int]:
+    """
+    Create DMCA reports for many matches with one lookup query and one INSERT ... RETURNING.
+    
+    Args:
+        db: Database session
+        items: (user_id, match_id, scraped_data) per report
+        group_id: Optional group ID shared by every report in the batch
+        commit: Commit once at the end; pass False to leave it to the caller
+        
+    Returns:
+        IDs of the created reports, in the same order as items
+    """
+    if not items:
+        return []
+    
+    try:
+        match_ids = {match_id for _, match_id, _ in items}
+        sources = {row[0]: row[1:] for row in db.execute(_match_sources_query(match_ids))}
+        missing = match_ids - sources.keys()
+        if missing:
+            raise ValueError(f"Matches not found: {sorted(missing)}")
+        
+        now = datetime.utcnow()
+        rows = [
+            _report_values(user_id, match_id, scraped_data, group_id, *sources[match_id], now)
+            for user_id, match_id, scraped_data in items
+        ]
+        report_ids = db.scalars(
+            insert(DmcaReports).returning(DmcaReports.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        if settings.DMCA_STORE_RAW_SERP:
+            db.execute(insert(DmcaReportRaw), [
+                {"report_id": report_id, "payload": _raw_payload(scraped_data)}
+                for report_id, (_, _, scraped_data) in zip(report_ids, items)
+            ])
+        if commit:
+            db.commit()
+        
+        logger.info("✅ Created %d DMCA reports in bulk", len(report_ids))
+        return report_ids
+        
+    except ValueError as ve:
+        logger.error("❌ Validation error creating DMCA reports: %s", ve)
         raise
     except Exception as e:
         db.rollback()
-        logger.exception(f"❌ Failed to create DMCA report for user {user_id}, match {match_id}")
+        logger.exception("❌ Failed to create %d DMCA reports in bulk", len(items))
         raise
 
 
+def create_dmca_reports_for_asset(
+    db: Session,
+    user_id: int,
+    match_ids: List[int],
+    scraped_list: List[Dict[str, Any]],
+    commit: bool = True
+) -> List[int]:
+    """
+    Create one DMCA report per infringement of the same original asset, all under a single
+    infringement group. The group ID is generated once for the batch rather than per row.
+    
+    Args:
+        db: Database session
+        user_id: User ID creating the reports
+        match_ids: IDs of the IP matches against the asset
+        scraped_list: Scraped data for each match, in the same order as match_ids
+        commit: Commit once at the end; pass False to leave it to the caller
+        
+    Returns:
+        IDs of the created reports, in the same order as match_ids
+    """
+    return create_dmca_reports_bulk(
+        db,
+        [(user_id, match_id, scraped_data) for match_id, scraped_data in zip(match_ids, scraped_list)],
+        group_id=uuid.uuid4().hex,
+        commit=commit
+    )
+
+
 def get_dmca_reports(db: Session, user_id: int, limit: int = 100) -> list:
     """Get all DMCA reports for a user."""
     try:
@@ -139,10 +265,10 @@ def get_dmca_reports(db: Session, user_id: int, limit: int = 100) -> list:
             .limit(limit)
             .all()
         )
-        logger.info(f"✅ Retrieved {len(reports)} DMCA reports for user {user_id}")
+        logger.info("✅ Retrieved %d DMCA reports for user %s", len(reports), user_id)
         return reports
     except Exception as e:
-        logger.exception(f"❌ Failed to get DMCA reports for user {user_id}")
+        logger.exception("❌ Failed to get DMCA reports for user %s", user_id)
         raise
 
 
@@ -153,45 +279,63 @@ def get_grouped_dmca_reports(db: Session, user_id: int) -> Dict[str, list]:
     Returns a dictionary: {asset_id: [reports]}
     """
     try:
+        # Sorted by asset in SQL (dmca_user_asset_created index), so groups are contiguous
         reports = (
             db.query(DmcaReports)
             .filter(DmcaReports.user_id == user_id)
-            .order_by(DmcaReports.created_at.desc())
+            .order_by(DmcaReports.original_asset_id.nulls_first(), DmcaReports.created_at.desc())
             .all()
         )
         
-        # Group by original_asset_id
-        grouped = {}
-        for report in reports:
-            asset_id = report.original_asset_id or "ungrouped"
-            if asset_id not in grouped:
-                grouped[asset_id] = []
-            grouped[asset_id].append(report)
+        grouped = {
+            asset_id or "ungrouped": list(group)
+            for asset_id, group in groupby(reports, key=attrgetter("original_asset_id"))
+        }
         
-        logger.info(f"✅ Retrieved {len(reports)} DMCA reports in {len(grouped)} groups for user {user_id}")
+        logger.info("✅ Retrieved %d DMCA reports in %d groups for user %s", len(reports), len(grouped), user_id)
         return grouped
         
     except Exception as e:
-        logger.exception(f"❌ Failed to get grouped DMCA reports for user {user_id}")
+        logger.exception("❌ Failed to get grouped DMCA reports for user %s", user_id)
+        raise
+
+
+def get_group_counts(db: Session, user_id: int) -> Dict[Any, int]:
+    """
+    Count a user's DMCA reports per original asset without loading the rows.
+    
+    Returns a dictionary: {asset_id or "ungrouped": count}
+    """
+    try:
+        rows = db.execute(
+            select(DmcaReports.original_asset_id, func.count())
+            .where(DmcaReports.user_id == user_id)
+            .group_by(DmcaReports.original_asset_id)
+        )
+        return {asset_id or "ungrouped": count for asset_id, count in rows}
+    except Exception as e:
+        logger.exception("❌ Failed to count DMCA report groups for user %s", user_id)
         raise
 
 
 def update_dmca_status(db: Session, report_id: int, status: str) -> DmcaReports:
     """Update the status of a DMCA report."""
     try:
-        report = db.query(DmcaReports).filter(DmcaReports.id == report_id).first()
+        report = db.scalars(
+            update(DmcaReports)
+            .where(DmcaReports.id == report_id)
+            .values(status=status, updated_at=datetime.utcnow())
+            .returning(DmcaReports)
+        ).first()
         if not report:
             raise ValueError(f"DMCA report not found: {report_id}")
         
-        report.status = status
-        report.updated_at = datetime.utcnow()
         db.commit()
-        db.refresh(report)
         
-        logger.info(f"✅ Updated DMCA report {report_id} status to: {status}")
+        logger.info("✅ Updated DMCA report %s status to: %s", report_id, status)
         return report
         
     except Exception as e:
         db.rollback()
-        logger.exception(f"❌ Failed to update DMCA report {report_id}")
+        logger.exception("❌ Failed to update DMCA report %s", report_id)
         raise
\ No newline at end of file
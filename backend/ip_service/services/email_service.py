@@ -1,12 +1,13 @@
 # ip_service/services/email_service.py - FIXED
 import os
+import asyncio
 import logging
 import aiosmtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
@@ -17,71 +18,138 @@ EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASS = os.getenv("EMAIL_PASS")
 
 # Debug logging
-logger.info(f"🔍 Email Service Initialized:")
-logger.info(f"   Host: {EMAIL_HOST}")
-logger.info(f"   Port: {EMAIL_PORT}")
-logger.info(f"   User: {EMAIL_USER}")
-logger.info(f"   Pass exists: {EMAIL_PASS is not None}")
+logger.info("🔍 Email Service Initialized:")
+logger.info("   Host: %s", EMAIL_HOST)
+logger.info("   Port: %s", EMAIL_PORT)
+logger.info("   User: %s", EMAIL_USER)
+logger.info("   Pass exists: %s", EMAIL_PASS is not None)
 
-async def send_dmca_email(
+class SMTPPool:
+    """
+    One authenticated SMTP connection reused across sends, so a batch pays the
+    TLS handshake and AUTH once. Checked with NOOP before reuse and rotated
+    after max_messages sends.
+    """
+
+    def __init__(self, hostname: str, port: int, username: Optional[str], password: Optional[str],
+                 max_messages: int = 500):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._sent = 0
+        # Serialises sends: an SMTP session carries one transaction at a time
+        self.lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(hostname=self.hostname, port=self.port, use_tls=False, start_tls=True)
+        await client.connect()
+        await client.login(self.username, self.password)
+        self._client = client
+        self._sent = 0
+        return client
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+    def discard(self) -> None:
+        """Drop the connection without talking to the server; safe during cancellation."""
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def _get_client(self) -> aiosmtplib.SMTP:
+        if self._client is not None and self._sent >= self.max_messages:
+            await self.close()
+        if self._client is None or not self._client.is_connected:
+            return await self._connect()
+        try:
+            await self._client.noop()
+        except aiosmtplib.SMTPException:
+            # Server dropped the idle session; open a fresh one
+            self._client.close()
+            return await self._connect()
+        return self._client
+
+    async def send_message(self, message: MIMEMultipart) -> None:
+        """Send on the pooled connection. Caller must hold self.lock."""
+        client = await self._get_client()
+        try:
+            await client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            client = await self._connect()
+            await client.send_message(message)
+        self._sent += 1
+
+
+_smtp_pool = SMTPPool(EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASS)
+
+
+def _read_pdf(pdf_path: str) -> Optional[bytes]:
+    """Blocking read of the report PDF; call via asyncio.to_thread from async code."""
+    if not os.path.exists(pdf_path):
+        logger.warning("⚠️ PDF not found: %s", pdf_path)
+        return None
+    with open(pdf_path, "rb") as pdf_file:
+        return pdf_file.read()
+
+
+def build_dmca_message(
     recipient_email: str,
     recipient_name: Optional[str],
     report_data: Dict[str, Any],
-    pdf_path: str,
+    pdf_bytes: Optional[bytes],
     user_info: Dict[str, Any],
     additional_message: Optional[str] = None
-) -> Dict[str, Any]:
+) -> MIMEMultipart:
     """
-    Send DMCA report via email with PDF attachment.
+    Build the DMCA notice email, attaching the PDF when pdf_bytes is given.
     """
-    try:
-        # Validate email configuration
-        if not EMAIL_USER or not EMAIL_PASS:
-            error_msg = f"Email configuration missing. EMAIL_USER={EMAIL_USER is not None}, EMAIL_PASS={EMAIL_PASS is not None}"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg)
-        
-        logger.info(f"📧 Attempting to send email from {EMAIL_USER} to {recipient_email}")
-        
-        # Create message
-        message = MIMEMultipart()
-        message["From"] = f"Sentinel AI DMCA <{EMAIL_USER}>"
-        message["To"] = recipient_email
-        message["Subject"] = f"DMCA Takedown Notice - Report #{report_data.get('id', 'N/A')}"
-        
-        # Email body
-        recipient_display = recipient_name or "Sir/Madam"
-        body = create_email_body(recipient_display, report_data, user_info, additional_message)
-        
-        # Attach body
-        message.attach(MIMEText(body, "plain"))
-        
-        # Attach PDF if exists
-        if os.path.exists(pdf_path):
-            with open(pdf_path, "rb") as pdf_file:
-                pdf_attachment = MIMEApplication(pdf_file.read(), _subtype="pdf")
-                pdf_attachment.add_header(
-                    "Content-Disposition",
-                    "attachment",
-                    filename=f"dmca_report_{report_data.get('id', 'N/A')}.pdf"
-                )
-                message.attach(pdf_attachment)
-            logger.info(f"✅ PDF attached: {pdf_path}")
-        else:
-            logger.warning(f"⚠️ PDF not found: {pdf_path}")
-        
-        # Send email
-        logger.info(f"📤 Sending email via {EMAIL_HOST}:{EMAIL_PORT}")
-        await aiosmtplib.send(
-            message,
-            hostname=EMAIL_HOST,
-            port=EMAIL_PORT,
-            username=EMAIL_USER,
-            password=EMAIL_PASS,
-            start_tls=True,
+    message = MIMEMultipart()
+    message["From"] = f"Sentinel AI DMCA <{EMAIL_USER}>"
+    message["To"] = recipient_email
+    message["Subject"] = f"DMCA Takedown Notice - Report #{report_data.get('id', 'N/A')}"
+    
+    # Email body
+    recipient_display = recipient_name or "Sir/Madam"
+    body = create_email_body(recipient_display, report_data, user_info, additional_message)
+    
+    # Attach body
+    message.attach(MIMEText(body, "plain"))
+    
+    # Attach PDF if exists
+    if pdf_bytes is not None:
+        pdf_attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
+        pdf_attachment.add_header(
+            "Content-Disposition",
+            "attachment",
+            filename=f"dmca_report_{report_data.get('id', 'N/A')}.pdf"
         )
+        message.attach(pdf_attachment)
+    
+    return message
+
+
+def _check_email_config() -> None:
+    if not EMAIL_USER or not EMAIL_PASS:
+        error_msg = f"Email configuration missing. EMAIL_USER={EMAIL_USER is not None}, EMAIL_PASS={EMAIL_PASS is not None}"
+        logger.error("❌ %s", error_msg)
+        raise ValueError(error_msg)
+
+
+async def _send_pooled(recipient_email: str, message: MIMEMultipart) -> Dict[str, Any]:
+    """Send one built message on the pooled connection. Caller must hold _smtp_pool.lock."""
+    try:
+        await _smtp_pool.send_message(message)
         
-        logger.info(f"✅ DMCA email sent successfully to {recipient_email}")
+        logger.info("✅ DMCA email sent successfully to %s", recipient_email)
         
         return {
             "success": True,
@@ -91,66 +159,144 @@ async def send_dmca_email(
         }
         
     except aiosmtplib.SMTPException as e:
-        logger.error(f"❌ SMTP error sending email: {str(e)}")
+        logger.error("❌ SMTP error sending email: %s", e)
+        # Don't reuse a session left mid-transaction
+        await _smtp_pool.close()
         return {
             "success": False,
             "error": f"SMTP error: {str(e)}",
             "message": "Failed to send email due to SMTP error"
         }
-    except Exception as e:
-        logger.exception(f"❌ Failed to send DMCA email to {recipient_email}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to send email: {str(e)}"
-        }
+    except BaseException:
+        # Cancelled or failed mid-transaction: the session state is unknown
+        _smtp_pool.discard()
+        raise
 
 
-def create_email_body(
-    recipient_name: str,
+def _send_failure(recipient_email: str, e: Exception) -> Dict[str, Any]:
+    logger.exception("❌ Failed to send DMCA email to %s", recipient_email)
+    return {
+        "success": False,
+        "error": str(e),
+        "message": f"Failed to send email: {str(e)}"
+    }
+
+
+async def send_dmca_email(
+    recipient_email: str,
+    recipient_name: Optional[str],
     report_data: Dict[str, Any],
+    pdf_path: str,
     user_info: Dict[str, Any],
     additional_message: Optional[str] = None
-) -> str:
-    """Create formatted email body for DMCA notice."""
+) -> Dict[str, Any]:
+    """
+    Send DMCA report via email with PDF attachment.
+    """
+    try:
+        # Validate email configuration
+        _check_email_config()
+        
+        logger.info("📧 Attempting to send email from %s to %s", EMAIL_USER, recipient_email)
+        # Disk read off the event loop
+        pdf_bytes = await asyncio.to_thread(_read_pdf, pdf_path)
+        message = build_dmca_message(
+            recipient_email, recipient_name, report_data, pdf_bytes, user_info, additional_message
+        )
+        
+        # Send email
+        logger.info("📤 Sending email via %s:%s", EMAIL_HOST, EMAIL_PORT)
+        async with _smtp_pool.lock:
+            return await _send_pooled(recipient_email, message)
+        
+    except Exception as e:
+        return _send_failure(recipient_email, e)
+
+
+async def send_dmca_email_batch(emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Send several DMCA emails over one SMTP connection.
     
-    body = f"""Dear {recipient_name},
+    Args:
+        emails: Keyword arguments for send_dmca_email, one dict per email
+        
+    Returns:
+        One send_dmca_email-style result per email, in the same order
+    """
+    try:
+        _check_email_config()
+    except ValueError as e:
+        return [_send_failure(kwargs["recipient_email"], e) for kwargs in emails]
+    
+    # Each distinct PDF is read once, off the event loop, even if several recipients get it
+    paths = {kwargs["pdf_path"] for kwargs in emails}
+    pdfs = await asyncio.to_thread(lambda: {path: _read_pdf(path) for path in paths})
+    
+    logger.info("📤 Sending %d emails via %s:%s", len(emails), EMAIL_HOST, EMAIL_PORT)
+    results = []
+    async with _smtp_pool.lock:
+        for kwargs in emails:
+            try:
+                message = build_dmca_message(
+                    kwargs["recipient_email"],
+                    kwargs.get("recipient_name"),
+                    kwargs["report_data"],
+                    pdfs[kwargs["pdf_path"]],
+                    kwargs["user_info"],
+                    kwargs.get("additional_message")
+                )
+                results.append(await _send_pooled(kwargs["recipient_email"], message))
+            except Exception as e:
+                results.append(_send_failure(kwargs["recipient_email"], e))
+    return results
+
+
+# Section rule, substituted into the templates once at import
+_SEP = "━" * 52
+
+
+def _with_separators(template: str) -> str:
+    return template.replace("{sep}", _SEP)
+
+
+# Single template per email; optional sections are pre-rendered into fields
+DMCA_TEMPLATE = _with_separators("""Dear {recipient_name},
 
 This is a formal DMCA takedown notice regarding copyright infringement detected on your platform.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
                     DMCA TAKEDOWN NOTICE
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
-Report ID: #{report_data.get('id', 'N/A')}
-Date: {datetime.utcnow().strftime("%B %d, %Y at %H:%M UTC")}
+Report ID: #{report_id}
+Date: {notice_date}
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 COPYRIGHT HOLDER INFORMATION
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
-Name: {user_info.get('full_name') or user_info.get('username', 'N/A')}
-Email: {user_info.get('email', 'N/A')}
-{f"Phone: {user_info.get('phone_number', 'N/A')}" if user_info.get('phone_number') else ""}
+Name: {holder_name}
+Email: {holder_email}
+{phone_line}
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 INFRINGEMENT DETAILS
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
 Infringing Content URL:
-{report_data.get('infringing_url', 'N/A')}
+{infringing_url}
 
 Original Copyrighted Work URL:
-{report_data.get('original_image_url', 'N/A')}
+{original_image_url}
 
-Similarity Score: {float(report_data.get('similarity_score', 0)) * 100:.1f}%
-Detection Date: {report_data.get('created_at', 'N/A')}
+Similarity Score: {similarity_score:.1f}%
+Detection Date: {created_at}
 
-{f"Description: {report_data.get('image_caption', 'N/A')}" if report_data.get('image_caption') else ""}
+{description_line}
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 LEGAL STATEMENTS
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
 GOOD FAITH BELIEF:
 I have a good faith belief that the use of the copyrighted material 
@@ -163,29 +309,18 @@ notification is accurate and that I am the copyright owner or
 authorized to act on behalf of the owner of an exclusive right 
 that is allegedly infringed.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 REQUESTED ACTION
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
 I request that you immediately:
 1. Remove or disable access to the infringing material identified above
 2. Provide confirmation of removal within 48 hours
 3. Take appropriate action against the user who uploaded this content
 
-"""
-
-    if additional_message:
-        body += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-ADDITIONAL MESSAGE FROM COPYRIGHT HOLDER
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-{additional_message}
-
-"""
-
-    body += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{additional_section}{sep}
 SUPPORTING DOCUMENTATION
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
 Please find the complete DMCA report attached as a PDF document 
 containing detailed evidence, screenshots, and supporting information.
@@ -196,22 +331,58 @@ copyright holder at the email address provided above.
 Thank you for your prompt attention to this matter.
 
 Best regards,
-{user_info.get('full_name') or user_info.get('username', 'Copyright Holder')}
+{signature_name}
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 
 This notice was generated by Sentinel AI - IP Protection Platform
 https://sentinelai.com
 
 For questions about this service, contact: support@sentinelai.com
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{sep}
 This is an automated message sent on behalf of the copyright holder.
 For authenticity verification, please contact the sender directly.
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
-    
-    return body
+{sep}
+""")
+
+ADDITIONAL_MESSAGE_SECTION = _with_separators("""{sep}
+ADDITIONAL MESSAGE FROM COPYRIGHT HOLDER
+{sep}
+
+{additional_message}
+
+""")
+
+
+def create_email_body(
+    recipient_name: str,
+    report_data: Dict[str, Any],
+    user_info: Dict[str, Any],
+    additional_message: Optional[str] = None
+) -> str:
+    """Create formatted email body for DMCA notice."""
+    phone = user_info.get('phone_number')
+    caption = report_data.get('image_caption')
+    fields = {
+        "recipient_name": recipient_name,
+        "report_id": report_data.get('id', 'N/A'),
+        "notice_date": datetime.utcnow().strftime("%B %d, %Y at %H:%M UTC"),
+        "holder_name": user_info.get('full_name') or user_info.get('username', 'N/A'),
+        "holder_email": user_info.get('email', 'N/A'),
+        "phone_line": f"Phone: {phone}" if phone else "",
+        "infringing_url": report_data.get('infringing_url', 'N/A'),
+        "original_image_url": report_data.get('original_image_url', 'N/A'),
+        "similarity_score": float(report_data.get('similarity_score', 0)) * 100,
+        "created_at": report_data.get('created_at', 'N/A'),
+        "description_line": f"Description: {caption}" if caption else "",
+        "additional_section": (
+            ADDITIONAL_MESSAGE_SECTION.format(additional_message=additional_message)
+            if additional_message else ""
+        ),
+        "signature_name": user_info.get('full_name') or user_info.get('username', 'Copyright Holder'),
+    }
+    return DMCA_TEMPLATE.format_map(fields)
 
 
 # ✅ FIX: Return tuple instead of bool
@@ -224,9 +395,9 @@ def validate_email_config() -> tuple[bool, str]:
     """
     if not EMAIL_USER or not EMAIL_PASS:
         message = f"Email configuration missing - EMAIL_USER exists: {EMAIL_USER is not None}, EMAIL_PASS exists: {EMAIL_PASS is not None}"
-        logger.error(f"❌ {message}")
+        logger.error("❌ %s", message)
         return False, message  # ✅ Returns tuple
     
     message = f"Email configuration valid. Using: {EMAIL_USER}"
-    logger.info(f"✅ {message}")
+    logger.info("✅ %s", message)
     return True, message  # ✅ Returns tuple
\ No newline at end of file
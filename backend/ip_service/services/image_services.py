@@ -1,13 +1,19 @@
 import io
+import os
 import hashlib
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 import numpy as np
 from PIL import Image
-import imagehash
 import torch
 import clip
+from cachetools import LRUCache
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from models.ip_models import Images, ImageEmbeddings  # update import path if needed
@@ -17,15 +23,54 @@ from models.ip_models import Images, ImageEmbeddings  # update import path if ne
 # ------------------------
 device = "cuda" if torch.cuda.is_available() else "cpu"
 model, preprocess = clip.load("ViT-B/32", device=device)
+# clip.load already keeps fp16 weights on CUDA (and fp32 on CPU, where fp16
+# matmuls are slow). bf16 autocast on CPU is opt-in: it is only faster on CPUs
+# with native bf16 (AVX-512 BF16 / AMX) and shifts the stored embeddings.
+model = model.eval()
+CPU_BF16 = os.getenv("CLIP_CPU_BF16", "false").lower() in ("1", "true", "yes")
+_eager_visual = None  # kept while a compiled encoder is in use
+if device == "cuda" and hasattr(torch, "compile"):
+    _eager_visual = model.visual
+    model.visual = torch.compile(model.visual, mode="reduce-overhead")
+EMBED_BATCH_SIZE = 32
+DOWNLOAD_WORKERS = 8
+EMBEDDING_MODEL = "CLIP-ViT-B/32"
+
+# sha256 -> normalized embedding, so re-crawled bytes skip the GPU; misses
+# fall back to embeddings already stored for that sha256 before encoding
+_embedding_cache = LRUCache(maxsize=10000)
+_embedding_cache_lock = threading.Lock()
+
+# DCT-II basis for 32x32 pHash: DCT_M @ X @ DCT_M.T is scipy's dct along both axes,
+# up to a constant factor that the median comparison ignores
+_PHASH_SIZE = 32
+DCT_M = np.cos(
+    np.pi * np.arange(_PHASH_SIZE)[:, None] * (2 * np.arange(_PHASH_SIZE)[None, :] + 1) / (2 * _PHASH_SIZE)
+)
+
+# Shared keep-alive pool so repeat hosts (CDNs) skip the TCP/TLS handshake;
+# sized above DOWNLOAD_WORKERS so pool threads never wait on a connection
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "SentinelAIBot/1.0 (+mailto:you@domain.com)"
+for _scheme in ("http://", "https://"):
+    _SESSION.mount(_scheme, HTTPAdapter(pool_connections=32, pool_maxsize=32))
 
 # ------------------------
 # Helper functions
 # ------------------------
 def download_image(url: str, timeout=20):
-    headers = {"User-Agent": "SentinelAIBot/1.0 (+mailto:you@domain.com)"}
-    r = requests.get(url, headers=headers, timeout=timeout)
-    r.raise_for_status()
-    return r.content, r.headers.get("Content-Type", None)
+    """
+    Stream the image body, hashing each chunk as it arrives so SHA-256
+    overlaps the network read. Returns (content, content_type, sha256 hex).
+    """
+    hasher = hashlib.sha256()
+    buf = io.BytesIO()
+    with _SESSION.get(url, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            hasher.update(chunk)
+            buf.write(chunk)
+        return buf.getvalue(), r.headers.get("Content-Type", None), hasher.hexdigest()
 
 
 def sha256_bytes(b: bytes) -> str:
@@ -33,88 +78,205 @@ def sha256_bytes(b: bytes) -> str:
 
 
 def compute_phash(img: Image.Image) -> str:
-    return str(imagehash.phash(img))
+    """
+    64-bit perceptual hash as 16 hex chars; same bits as str(imagehash.phash(img)).
+    """
+    pixels = np.asarray(img.convert("L").resize((_PHASH_SIZE, _PHASH_SIZE), Image.LANCZOS), dtype=np.float64)
+    low_freq = (DCT_M @ pixels @ DCT_M.T)[:8, :8]
+    return np.packbits(low_freq > np.median(low_freq)).tobytes().hex()
 
 
-def compute_clip_embedding(img: Image.Image) -> np.ndarray:
-    img_input = preprocess(img).unsqueeze(0).to(device)
-    with torch.no_grad():
-        emb = model.encode_image(img_input).float()
+@contextmanager
+def _cudnn_benchmark():
+    """
+    Enable cuDNN's per-shape kernel autotune (CLIP inputs are always 3x224x224)
+    only around our own forward, leaving the process-wide flag as we found it.
+    """
+    previous = torch.backends.cudnn.benchmark
+    torch.backends.cudnn.benchmark = True
+    try:
+        yield
+    finally:
+        torch.backends.cudnn.benchmark = previous
+
+
+def _encode_image(batch: torch.Tensor) -> torch.Tensor:
+    """
+    encode_image; compilation is lazy, so a compiled encoder that fails on a real
+    call is swapped back to the eager one and the call retried.
+    """
+    global _eager_visual
+    try:
+        return model.encode_image(batch)
+    except torch.cuda.OutOfMemoryError:
+        raise
+    except Exception as e:
+        if _eager_visual is None:
+            raise
+        print(f"Compiled CLIP visual encoder failed, using eager model: {e}")
+        model.visual, _eager_visual = _eager_visual, None
+        return model.encode_image(batch)
+
+
+def compute_clip_embeddings(imgs: list[Image.Image]) -> np.ndarray:
+    """
+    Embed a list of images in one encode_image call; returns (len(imgs), dim).
+    """
+    batch = torch.stack([preprocess(i) for i in imgs]).to(device, non_blocking=True)
+    if device == "cuda":
+        batch = batch.half()
+    cudnn_benchmark = _cudnn_benchmark() if device == "cuda" else nullcontext()
+    with torch.inference_mode(), cudnn_benchmark, torch.autocast("cpu", dtype=torch.bfloat16, enabled=device == "cpu" and CPU_BF16):
+        emb = _encode_image(batch).float()
     emb = emb / emb.norm(dim=-1, keepdim=True)  # normalize
-    return emb.cpu().numpy()[0].astype(np.float32)
+    return emb.cpu().numpy().astype(np.float32)
+
+
+def compute_clip_embedding(img: Image.Image) -> np.ndarray:
+    return compute_clip_embeddings([img])[0]
+
+
+def _build_metadata(image_url: str, source_page_url: str | None, content: bytes,
+                    content_type: str | None, sha: str, img: Image.Image) -> dict:
+    width, height = img.size
+    return {
+        "source_page_url": source_page_url,
+        "image_url": image_url,
+        "domain": urlparse(image_url).netloc,
+        "status_code": 200,
+        "content_type": content_type,
+        "file_size_bytes": len(content),
+        "width": width,
+        "height": height,
+        "page_title": None,
+        "img_alt": None,
+        "sha256": sha,
+        "phash": compute_phash(img),
+        "s3_path": None
+    }
+
+
+def _fetch_and_decode(image_url: str, source_page_url: str | None):
+    """
+    Download and decode one image; returns (PIL image, metadata) or None.
+    Runs in the download pool, so failures are logged here and not raised.
+    """
+    try:
+        content, content_type, sha = download_image(image_url)
+        img = Image.open(io.BytesIO(content)).convert("RGB")
+        return img, _build_metadata(image_url, source_page_url, content, content_type, sha, img)
+    except Exception as e:
+        print(f"Failed to process {image_url}: {e}")
+        return None
 
 
 # ------------------------
 # Main service functions
 # ------------------------
+_IMAGE_COLUMNS = (
+    "source_page_url", "image_url", "domain", "status_code", "content_type",
+    "file_size_bytes", "width", "height", "page_title", "img_alt",
+    "sha256", "phash", "s3_path",
+)
+
+
 def insert_image(db: Session, metadata: dict, embedding: np.ndarray = None) -> Images:
     """
     Insert image record into DB using SQLAlchemy models.
     """
-    img = Images(
-        source_page_url=metadata.get("source_page_url"),
-        image_url=metadata.get("image_url"),
-        domain=metadata.get("domain"),
-        status_code=metadata.get("status_code"),
-        content_type=metadata.get("content_type"),
-        file_size_bytes=metadata.get("file_size_bytes"),
-        width=metadata.get("width"),
-        height=metadata.get("height"),
-        page_title=metadata.get("page_title"),
-        img_alt=metadata.get("img_alt"),
-        sha256=metadata.get("sha256"),
-        phash=metadata.get("phash"),
-        s3_path=metadata.get("s3_path")
-    )
-    db.add(img)
+    return insert_images(db, [metadata], None if embedding is None else [embedding])[0]
+
+
+def insert_images(db: Session, metadatas: list[dict], embeddings=None) -> list[Images]:
+    """
+    Insert a batch of images and their embeddings in a single transaction:
+    one INSERT ... RETURNING for the images, one executemany for the embeddings.
+    """
+    images = db.scalars(
+        insert(Images).returning(Images, sort_by_parameter_order=True),
+        [{col: m.get(col) for col in _IMAGE_COLUMNS} for m in metadatas]
+    ).all()
+
+    if embeddings is not None:
+        db.execute(insert(ImageEmbeddings), [
+            {"image_id": img.id, "vector": emb, "model": EMBEDDING_MODEL}
+            for img, emb in zip(images, embeddings)
+        ])
     db.commit()
-    db.refresh(img)
+    return images
 
-    # Insert embedding if available
-    if embedding is not None:
-        img_emb = ImageEmbeddings(
-            image_id=img.id,
-            vector=embedding.tolist(),  # store as list
-            model="CLIP-ViT-B/32"
-        )
-        db.add(img_emb)
-        db.commit()
-        db.refresh(img_emb)
 
-    return img
+def _stored_embeddings(db: Session, shas: set) -> dict:
+    """Embeddings already in the DB for these sha256 digests, from this model."""
+    rows = db.execute(
+        select(Images.sha256, ImageEmbeddings.vector)
+        .join(ImageEmbeddings, ImageEmbeddings.image_id == Images.id)
+        .where(Images.sha256.in_(shas), ImageEmbeddings.model == EMBEDDING_MODEL)
+    )
+    return {sha: np.asarray(vector, dtype=np.float32) for sha, vector in rows}
 
 
-def process_image_url(db: Session, image_url: str, source_page_url: str = None) -> Images | None:
+def embed_with_cache(db: Session, imgs: list, shas: list) -> list[np.ndarray]:
     """
-    Download, process, compute embedding, and insert into DB.
+    Embeddings for imgs, reusing any already computed for the same bytes
+    (in-process LRU, then the DB); only the rest go to the GPU, once per sha.
     """
-    try:
-        content, content_type = download_image(image_url)
-        sha = sha256_bytes(content)
-        img = Image.open(io.BytesIO(content)).convert("RGB")
-        width, height = img.size
-        phash = compute_phash(img)
-        embedding = compute_clip_embedding(img)
-
-        metadata = {
-            "source_page_url": source_page_url,
-            "image_url": image_url,
-            "domain": urlparse(image_url).netloc,
-            "status_code": 200,
-            "content_type": content_type,
-            "file_size_bytes": len(content),
-            "width": width,
-            "height": height,
-            "page_title": None,
-            "img_alt": None,
-            "sha256": sha,
-            "phash": phash,
-            "s3_path": None
-        }
-
-        inserted_image = insert_image(db, metadata, embedding)
-        return inserted_image
+    with _embedding_cache_lock:
+        known = {sha: _embedding_cache[sha] for sha in set(shas) if sha in _embedding_cache}
+
+    missing = set(shas) - known.keys()
+    if missing:
+        known.update(_stored_embeddings(db, missing))
 
+    to_encode = {}
+    for img, sha in zip(imgs, shas):
+        if sha not in known:
+            to_encode.setdefault(sha, img)
+    if to_encode:
+        known.update(zip(to_encode, compute_clip_embeddings(list(to_encode.values()))))
+
+    with _embedding_cache_lock:
+        for sha in set(shas):
+            _embedding_cache[sha] = known[sha]
+    return [known[sha] for sha in shas]
+
+
+def _embed_and_insert(db: Session, pending: list) -> list[Images]:
+    imgs, metadatas = zip(*pending)
+    try:
+        embeddings = embed_with_cache(db, list(imgs), [m["sha256"] for m in metadatas])
+        return insert_images(db, list(metadatas), embeddings)
     except Exception as e:
-        print(f"Failed to process {image_url}: {e}")
-        return None
\ No newline at end of file
+        db.rollback()
+        print(f"Failed to process batch of {len(pending)} images: {e}")
+        return []
+
+
+def process_image_urls(db: Session, image_urls: list[str], source_page_url: str = None,
+                       batch_size: int = EMBED_BATCH_SIZE) -> list[Images]:
+    """
+    Download URLs concurrently, embed them batch_size at a time and insert
+    each batch with one commit. URLs that fail to download or decode are
+    skipped; a failed batch is rolled back and skipped.
+    """
+    inserted: list[Images] = []
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        decoded = pool.map(lambda u: _fetch_and_decode(u, source_page_url), image_urls)
+        pending = []
+        for item in decoded:
+            if item is not None:
+                pending.append(item)
+            if len(pending) == batch_size:
+                inserted.extend(_embed_and_insert(db, pending))
+                pending = []
+        if pending:
+            inserted.extend(_embed_and_insert(db, pending))
+    return inserted
+
+
+def process_image_url(db: Session, image_url: str, source_page_url: str = None) -> Images | None:
+    """
+    Download, process, compute embedding, and insert into DB.
+    """
+    inserted = process_image_urls(db, [image_url], source_page_url, batch_size=1)
+    return inserted[0] if inserted else None
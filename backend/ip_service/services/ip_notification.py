@@ -1,3 +1,8 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ip_service.models.ip_models import Notifications
 
@@ -9,9 +14,56 @@ def create_notification(db: Session, user_id: int, message: str):
     db.refresh(notification)
     return notification
 
-def get_user_notifications(db: Session, user_id: int):
-    """Retrieve unread notifications for a user"""
-    return db.query(Notifications).filter(Notifications.user_id == user_id).order_by(Notifications.created_at.desc()).all()
+def create_notifications_bulk(db: Session, user_id: int, notifications: List[dict]) -> int:
+    """Insert several notifications for a user in one executemany and a single commit.
+
+    Each item holds the Notifications columns to set, at least "message".
+    """
+    if not notifications:
+        return 0
+    db.execute(insert(Notifications), [{"user_id": user_id, **n} for n in notifications])
+    db.commit()
+    return len(notifications)
+
+def _user_notifications_query(
+    user_id: int,
+    unread_only: bool = False,
+    before: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+):
+    query = select(Notifications).where(Notifications.user_id == user_id)
+    if unread_only:
+        query = query.where(Notifications.read.is_(False))
+    if before is not None:
+        query = query.where(tuple_(Notifications.created_at, Notifications.id) < tuple_(*before))
+    query = query.order_by(Notifications.created_at.desc(), Notifications.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def _watermark_query(user_id: int):
+    return select(
+        func.max(Notifications.id),
+        func.count(Notifications.id),
+        func.count(Notifications.id).filter(Notifications.read.is_(True)),
+    ).where(Notifications.user_id == user_id)
+
+def get_user_notifications(
+    db: Session,
+    user_id: int,
+    unread_only: bool = False,
+    before: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+):
+    """Retrieve notifications for a user, newest first; unread_only hits the partial unread index.
+
+    before is a (created_at, id) keyset cursor: only rows strictly older than it are returned.
+    """
+    return db.scalars(_user_notifications_query(user_id, unread_only, before, limit)).all()
+
+def get_notification_watermark(db: Session, user_id: int) -> tuple:
+    """Return (max id, total, read count) for a user's notifications; changes whenever the list does"""
+    return tuple(db.execute(_watermark_query(user_id)).one())
 
 def mark_notification_as_read(db: Session, notification_id: int):
     """Mark a notification as read"""
@@ -20,4 +72,40 @@ def mark_notification_as_read(db: Session, notification_id: int):
         notification.read = True
         db.commit()
         db.refresh(notification)
-    return notification
\ No newline at end of file
+    return notification
+
+# ---------------------- Async variants (AsyncSession / asyncpg) ----------------------
+
+async def create_notification_async(db: AsyncSession, user_id: int, message: str):
+    """Create a new notification for a user in a single INSERT ... RETURNING"""
+    notification = await db.scalar(
+        insert(Notifications).values(user_id=user_id, message=message).returning(Notifications)
+    )
+    await db.commit()
+    return notification
+
+async def get_user_notifications_async(
+    db: AsyncSession,
+    user_id: int,
+    unread_only: bool = False,
+    before: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+):
+    """Async counterpart of get_user_notifications"""
+    return (await db.scalars(_user_notifications_query(user_id, unread_only, before, limit))).all()
+
+async def stream_user_notifications_async(
+    db: AsyncSession,
+    user_id: int,
+    unread_only: bool = False,
+    before: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+):
+    """Yield a user's notifications one by one, fetching from the server cursor in batches"""
+    query = _user_notifications_query(user_id, unread_only, before, limit).execution_options(yield_per=200)
+    async for notification in await db.stream_scalars(query):
+        yield notification
+
+async def get_notification_watermark_async(db: AsyncSession, user_id: int) -> tuple:
+    """Async counterpart of get_notification_watermark"""
+    return tuple((await db.execute(_watermark_query(user_id))).one())
\ No newline at end of file
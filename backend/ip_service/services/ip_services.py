@@ -6,7 +6,6 @@ from typing import Dict
 from scrapping.pipeline import run_pipeline
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 async def execute_ip_pipeline(file_bytes: bytes, user_id: int, filename: str, db: Session) -> Dict:
     """
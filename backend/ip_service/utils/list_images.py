@@ -1,10 +1,12 @@
 import os
 
+_IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png"})
+
 def list_images(folder_path):
     """Return list of image file paths in a folder."""
-    valid_exts = (".jpg", ".jpeg", ".png")
-    return [
-        os.path.join(folder_path, f)
-        for f in os.listdir(folder_path)
-        if f.lower().endswith(valid_exts)
-    ]
\ No newline at end of file
+    with os.scandir(folder_path) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in _IMAGE_EXTS and entry.is_file()
+        ]
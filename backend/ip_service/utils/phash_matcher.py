@@ -1,13 +1,131 @@
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
 from imagededup.methods import PHash
 
+# Plain-data index of the folder's hashes; the BK-tree is rebuilt from it in memory
+INDEX_FILENAME = ".phash_index.json"
+# Bump whenever phash_batch/_load_gray change output so stored hashes are recomputed
+PHASH_VERSION = 2
+DECODE_WORKERS = 8
+
+# DCT-II basis: DCT_M @ X @ DCT_M.T is scipy's 2-D dct up to a constant
+# factor, which the median threshold ignores
+_PHASH_SIZE = 32
+DCT_M = np.cos(
+    np.pi * np.arange(_PHASH_SIZE)[:, None] * (2 * np.arange(_PHASH_SIZE)[None, :] + 1) / (2 * _PHASH_SIZE)
+)
+
+
+# JPEGs are decoded by libjpeg at a reduced DCT scale (1/2 to 1/8) no smaller
+# than this; 4x the hash input keeps the LANCZOS resize on enough pixels
+_DRAFT_SIZE = 4 * _PHASH_SIZE
+
+
+def _load_gray(image_path):
+    """Decode to 32x32 grayscale the way imagededup does; None if unreadable."""
+    try:
+        with Image.open(image_path) as img:
+            # No-op for non-JPEG formats
+            img.draft("RGB", (_DRAFT_SIZE, _DRAFT_SIZE))
+            if img.mode != "RGB":
+                img = img.convert("RGBA").convert("RGB")
+            return np.asarray(img.resize((_PHASH_SIZE, _PHASH_SIZE), Image.LANCZOS).convert("L"))
+    except Exception:
+        return None
+
+
+def phash_batch(pixels):
+    """
+    imagededup-compatible pHashes for an (N, 32, 32) grayscale batch, as hex strings:
+    8x8 low-frequency block, >= median of the non-DC coefficients, MSB first.
+    """
+    low_freq = (DCT_M @ pixels.astype(np.float64) @ DCT_M.T)[:, :8, :8].reshape(len(pixels), 64)
+    medians = np.median(low_freq[:, 1:], axis=1, keepdims=True)
+    packed = np.packbits(low_freq >= medians, axis=1)
+    return [row.tobytes().hex() for row in packed]
+
+
+def _hamming_distances(target_encoding, candidate_encodings):
+    """Vectorized hamming distance between one 64-bit hex hash and many."""
+    target = np.uint64(int(target_encoding, 16))
+    hashes = np.array([int(h, 16) for h in candidate_encodings], dtype=np.uint64)
+    xor = (hashes ^ target).view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(xor, axis=1).sum(axis=1)
+
+
+def _hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer pHashes for Hamming radius queries."""
+
+    def __init__(self):
+        self.root = None  # [hash, [items], {distance: child}]
+
+    def add(self, hash_int, item):
+        if self.root is None:
+            self.root = [hash_int, [item], {}]
+            return
+        node = self.root
+        while True:
+            d = _hamming(hash_int, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [hash_int, [item], {}]
+                return
+            node = child
+
+    def find(self, hash_int, radius):
+        """Return [(distance, item)] for every item within radius of hash_int."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            d = _hamming(hash_int, node[0])
+            if d <= radius:
+                found.extend((d, item) for item in node[1])
+            # Triangle inequality: only children at d ± radius can hold matches
+            for child_d, child in node[2].items():
+                if d - radius <= child_d <= d + radius:
+                    stack.append(child)
+        return found
+
+
 class PHashMatcher:
     def __init__(self, threshold=5):
         self.phasher = PHash()
         self.threshold = threshold
+        self._indexes = {}  # candidates_folder -> (files, BKTree)
 
     def encode(self, image_path):
         """Return pHash encoding for a single image."""
-        return self.phasher.encode_image(image_path)
+        return self.encode_many([image_path])[image_path]
+
+    def encode_many(self, image_paths):
+        """
+        Return {path: encoding} for many images: decoded on a thread pool (PIL
+        releases the GIL), then hashed in one batched NumPy DCT. Unreadable
+        images map to None.
+        """
+        image_paths = list(image_paths)
+        with ThreadPoolExecutor(max_workers=DECODE_WORKERS) as pool:
+            decoded = list(pool.map(_load_gray, image_paths))
+
+        encodings = dict.fromkeys(image_paths)
+        ok = [i for i, pixels in enumerate(decoded) if pixels is not None]
+        if ok:
+            hashes = phash_batch(np.stack([decoded[i] for i in ok]))
+            for i, encoding in zip(ok, hashes):
+                encodings[image_paths[i]] = encoding
+        return encodings
 
     def compare(self, target_encoding, candidate_encoding):
         """Return distance between two encodings."""
@@ -17,20 +135,120 @@ class PHashMatcher:
         """Check if distance ≤ threshold."""
         return distance <= self.threshold
 
-    def find_matches(self, target_path, candidate_paths):
-        """Compare target against multiple candidates."""
-        target_encoding = self.encode(target_path)
-        results = []
-
-        for cand in candidate_paths:
-            cand_encoding = self.encode(cand)
-            distance = self.compare(target_encoding, cand_encoding)
-            match = self.is_match(distance)
+    def _match_encodings(self, target_encoding, encodings):
+        """Score {candidate: encoding} against the target in one NumPy pass."""
+        valid = [cand for cand, enc in encodings.items() if enc]
+        distances = {}
+        if target_encoding and valid:
+            scores = _hamming_distances(target_encoding, [encodings[c] for c in valid])
+            distances = dict(zip(valid, scores.tolist()))
 
+        results = []
+        for cand in encodings:
+            # Undecodable images have no encoding; report them as non-matches
+            distance = distances.get(cand)
             results.append({
                 "candidate": cand,
                 "distance": distance,
-                "match": match
+                "match": distance is not None and self.is_match(distance)
             })
+        return results
+
+    def find_matches(self, target_path, candidate_paths):
+        """Compare target against multiple candidates."""
+        target_encoding = self.encode(target_path)
+        encodings = self.encode_many(candidate_paths)
+        return self._match_encodings(target_encoding, encodings)
 
-        return results
\ No newline at end of file
+    def find_matches_in_dir(self, target_path, candidates_folder, recursive=False):
+        """Compare target against every image in a folder, encoded in one batch."""
+        target_encoding = self.encode(target_path)
+        if recursive:
+            paths = [os.path.join(root, name) for root, _, names in os.walk(candidates_folder) for name in names]
+        else:
+            paths = [os.path.join(candidates_folder, name) for name in os.listdir(candidates_folder)]
+        paths = [p for p in paths if os.path.isfile(p) and not os.path.basename(p).startswith(".")]
+        encodings = self.encode_many(paths)
+        # Keyed relative to the folder, as imagededup's encode_images does
+        return self._match_encodings(
+            target_encoding, {os.path.relpath(p, candidates_folder): enc for p, enc in encodings.items()}
+        )
+
+    @staticmethod
+    def _read_index(index_path):
+        """{name: [mtime_ns, size, encoding]} from the JSON index; {} if missing, unreadable or from another PHASH_VERSION."""
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != PHASH_VERSION:
+            return {}
+        files = payload.get("files")
+        return files if isinstance(files, dict) else {}
+
+    @staticmethod
+    def _write_index(index_path, files):
+        """Write via a temp file and os.replace so readers never see a partial index."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), prefix=INDEX_FILENAME, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": PHASH_VERSION, "files": files}, f)
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load_index(self, candidates_folder):
+        """
+        BK-tree of the folder's pHashes, kept in memory and backed by a JSON
+        index of {name: [mtime_ns, size, encoding]} next to the candidates.
+        Only new or modified files (by mtime and size) are encoded; any change
+        rebuilds the tree from the stored hashes, since BK-trees don't support
+        deletion.
+        """
+        index_path = os.path.join(candidates_folder, INDEX_FILENAME)
+        if candidates_folder in self._indexes:
+            files, tree = self._indexes[candidates_folder]
+        else:
+            files, tree = self._read_index(index_path), None
+
+        present = {}
+        with os.scandir(candidates_folder) as entries:
+            for entry in entries:
+                if not entry.name.startswith(".") and entry.is_file():
+                    st = entry.stat()
+                    present[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        unchanged = {
+            name: record for name, record in files.items()
+            if name in present and isinstance(record, list) and len(record) == 3
+            and tuple(record[:2]) == present[name]
+        }
+        stale = [name for name in present if name not in unchanged]
+        encodings = self.encode_many(os.path.join(candidates_folder, name) for name in stale)
+        for path, encoding in encodings.items():
+            name = os.path.basename(path)
+            # None marks undecodable files so they aren't retried every call
+            unchanged[name] = [*present[name], encoding]
+
+        if tree is None or unchanged != files:
+            tree = BKTree()
+            for name, (_, _, encoding) in unchanged.items():
+                if encoding:
+                    tree.add(int(encoding, 16), name)
+            if unchanged != files:
+                self._write_index(index_path, unchanged)
+            self._indexes[candidates_folder] = (unchanged, tree)
+        return tree
+
+    def find_matches_indexed(self, target_path, candidates_folder):
+        """Return only the folder's matches (distance ≤ threshold), via the cached BK-tree."""
+        target_encoding = self.encode(target_path)
+        if not target_encoding:
+            return []
+        tree = self._load_index(candidates_folder)
+        return [
+            {"candidate": name, "distance": distance, "match": True}
+            for distance, name in sorted(tree.find(int(target_encoding, 16), self.threshold))
+        ]
@@ -1,10 +1,14 @@
 # main.py
+import logging
 import os
 from dotenv import load_dotenv
 
 # ✅ CRITICAL: Load .env FIRST - before any other imports
 load_dotenv()
 
+# Root logging is configured here, once, rather than as an import side effect of each module
+logging.basicConfig(level=logging.INFO)
+
 # Print to verify environment variables are loaded
 print("=" * 60)
 print("🔍 Environment Variables Check (main.py startup)")
@@ -6,12 +6,12 @@ from PIL import Image, UnidentifiedImageError
 import torch
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # ---------------------- Globals ----------------------
 _blip_model = None
 _blip_processor = None
 _device = None
+_eager_vision_model = None  # kept while a compiled encoder is in use
 _lock = threading.Lock()
 _model_name = "Salesforce/blip-image-captioning-base"  # Public, lightweight model
 
@@ -23,7 +23,40 @@ def _get_device() -> str:
         logger.info("Captioner device set to %s", _device)
     return _device
 
+def _get_dtype() -> torch.dtype:
+    # Half precision on accelerators; CPU fp16 kernels are slow or missing
+    return torch.float16 if _get_device() in ("cuda", "mps") else torch.float32
+
 # ---------------------- Model Loader ----------------------
+def _compile_vision_tower(model) -> None:
+    """
+    torch.compile BLIP's vision encoder on CUDA. Only the encoder: it sees one
+    fixed input shape, whereas the text decoder's shape changes every
+    generation step and would keep recompiling.
+    """
+    global _eager_vision_model
+    if _get_device() != "cuda" or not hasattr(torch, "compile"):
+        return
+    _eager_vision_model = model.vision_model
+    model.vision_model = torch.compile(model.vision_model, mode="reduce-overhead")
+
+def _generate(max_new_tokens: int, **inputs):
+    """
+    generate(); compilation is lazy, so a compiled encoder that fails on a real
+    call is swapped back to the eager one and the call retried.
+    """
+    global _eager_vision_model
+    try:
+        return _blip_model.generate(**inputs, max_new_tokens=max_new_tokens)
+    except torch.cuda.OutOfMemoryError:
+        raise
+    except Exception:
+        if _eager_vision_model is None:
+            raise
+        logger.exception("Compiled BLIP vision encoder failed; using eager model")
+        _blip_model.vision_model, _eager_vision_model = _eager_vision_model, None
+        return _blip_model.generate(**inputs, max_new_tokens=max_new_tokens)
+
 def _ensure_model_loaded() -> None:
     """
     Load BLIP image captioning model.
@@ -41,7 +74,10 @@ def _ensure_model_loaded() -> None:
 
             logger.info("Loading BLIP caption model: %s ...", _model_name)
             _blip_processor = BlipProcessor.from_pretrained(_model_name)
-            _blip_model = BlipForConditionalGeneration.from_pretrained(_model_name).to(_get_device())
+            _blip_model = BlipForConditionalGeneration.from_pretrained(
+                _model_name, torch_dtype=_get_dtype()
+            ).to(_get_device()).eval()
+            _compile_vision_tower(_blip_model)
             logger.info("BLIP model loaded successfully: %s", _model_name)
 
         except Exception:
@@ -64,8 +100,9 @@ def generate_caption(image: Image.Image, max_new_tokens: int = 30) -> str:
             return ""
 
         # Prepare inputs
-        inputs = _blip_processor(images=image, return_tensors="pt").to(_get_device())
-        outputs = _blip_model.generate(**inputs, max_new_tokens=max_new_tokens)
+        # dtype only casts the float tensors (pixel_values) to match the weights
+        inputs = _blip_processor(images=image, return_tensors="pt").to(_get_device(), dtype=_get_dtype())
+        outputs = _generate(max_new_tokens, **inputs)
         caption = _blip_processor.decode(outputs[0], skip_special_tokens=True)
 
         if not caption:
@@ -1,18 +1,19 @@
 # scrapping/embedder.py
 import threading
 import logging
+from functools import lru_cache
 from typing import Tuple, Optional
 from PIL import Image
 import torch
 import numpy as np
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # ---------------------- Globals ----------------------
 _clip_model: Optional[torch.nn.Module] = None
 _clip_processor: Optional[object] = None
 _device: Optional[str] = None
+_eager_vision_model: Optional[torch.nn.Module] = None  # kept while a compiled encoder is in use
 _lock = threading.Lock()
 
 # ---------------------- Device Setup ----------------------
@@ -23,7 +24,40 @@ def _get_device() -> str:
         logger.info("Embedder device set to %s", _device)
     return _device
 
+def _get_dtype() -> torch.dtype:
+    # Half precision on accelerators; CPU fp16 kernels are slow or missing
+    return torch.float16 if _get_device() in ("cuda", "mps") else torch.float32
+
 # ---------------------- Model Loader ----------------------
+def _compile_vision_tower(model: torch.nn.Module) -> None:
+    """
+    torch.compile CLIP's vision encoder on CUDA. Only the encoder: its input is
+    always 224x224, whereas padded text lengths vary per prompt and would
+    recompile (and re-record CUDA graphs) for every new length.
+    """
+    global _eager_vision_model
+    if _get_device() != "cuda" or not hasattr(torch, "compile"):
+        return
+    _eager_vision_model = model.vision_model
+    model.vision_model = torch.compile(model.vision_model, mode="reduce-overhead")
+
+def _run_clip(**inputs):
+    """
+    Forward pass; compilation is lazy, so a compiled encoder that fails on a real
+    call is swapped back to the eager one and the call retried.
+    """
+    global _eager_vision_model
+    try:
+        return _clip_model(**inputs)
+    except torch.cuda.OutOfMemoryError:
+        raise
+    except Exception:
+        if _eager_vision_model is None:
+            raise
+        logger.exception("Compiled CLIP vision encoder failed; using eager model")
+        _clip_model.vision_model, _eager_vision_model = _eager_vision_model, None
+        return _clip_model(**inputs)
+
 def _ensure_model_loaded() -> None:
     global _clip_model, _clip_processor
     if _clip_model is not None and _clip_processor is not None:
@@ -36,11 +70,41 @@ def _ensure_model_loaded() -> None:
             model_name = "openai/clip-vit-large-patch14"
             logger.info("Loading CLIP model (%s)...", model_name)
             _clip_processor = CLIPProcessor.from_pretrained(model_name)
-            _clip_model = CLIPModel.from_pretrained(model_name).to(_get_device())
+            _clip_model = CLIPModel.from_pretrained(model_name, torch_dtype=_get_dtype()).to(_get_device()).eval()
+            _compile_vision_tower(_clip_model)
             logger.info("CLIP model loaded successfully.")
         except Exception:
             logger.exception("Failed to load CLIP model; embeddings will be unavailable.")
 
+# ---------------------- Image Preprocessing ----------------------
+@lru_cache(maxsize=8)
+def _norm_constants(mean: tuple, std: tuple, device: str, dtype: torch.dtype):
+    """CLIP mean/std as (1, 3, 1, 1) tensors, placed on the device once."""
+    return (
+        torch.tensor(mean, device=device, dtype=dtype).view(1, 3, 1, 1),
+        torch.tensor(std, device=device, dtype=dtype).view(1, 3, 1, 1),
+    )
+
+def preprocess_on_device(images, image_processor, device: str, dtype: torch.dtype) -> torch.Tensor:
+    """
+    CLIPProcessor's resize/crop/normalize, but the host->device copy is uint8
+    (4x fewer bytes than float32) and the normalization runs on the device.
+    """
+    short = image_processor.size["shortest_edge"]
+    crop = image_processor.crop_size["height"]
+    arrays = []
+    for img in images:
+        img = img.convert("RGB")
+        w, h = img.size
+        new_w, new_h = (short, int(short * h / w)) if w <= h else (int(short * w / h), short)
+        left, top = (new_w - crop) // 2, (new_h - crop) // 2
+        img = img.resize((new_w, new_h), Image.BICUBIC).crop((left, top, left + crop, top + crop))
+        arrays.append(np.asarray(img))
+
+    batch = torch.from_numpy(np.stack(arrays)).permute(0, 3, 1, 2).to(device, non_blocking=True)
+    mean, std = _norm_constants(tuple(image_processor.image_mean), tuple(image_processor.image_std), device, dtype)
+    return batch.to(dtype).div_(255).sub_(mean).div_(std)
+
 # ---------------------- Embedding Generator ----------------------
 def generate_embedding(image: Image.Image, text: str, normalize: bool = True) -> Tuple[Optional[torch.Tensor], Optional[torch.Tensor]]:
     if image is None:
@@ -52,11 +116,13 @@ def generate_embedding(image: Image.Image, text: str, normalize: bool = True) ->
         if _clip_model is None or _clip_processor is None:
             return None, None
 
-        inputs = _clip_processor(text=[text or ""], images=image, return_tensors="pt", padding=True).to(_get_device())
+        inputs = _clip_processor.tokenizer([text or ""], return_tensors="pt", padding=True).to(_get_device())
+        pixel_values = preprocess_on_device([image], _clip_processor.image_processor, _get_device(), _get_dtype())
         with torch.no_grad():
-            outputs = _clip_model(**inputs)
-            img_emb = outputs.image_embeds[0]
-            txt_emb = outputs.text_embeds[0]
+            outputs = _run_clip(**inputs, pixel_values=pixel_values)
+            # Back to fp32 for normalisation, similarity and storage
+            img_emb = outputs.image_embeds[0].float()
+            txt_emb = outputs.text_embeds[0].float()
 
         if normalize:
             img_emb = img_emb / img_emb.norm()
@@ -1,8 +1,8 @@
 # scrapping/icrawler_image_search.py
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from time import sleep
 import requests
 from PIL import Image, UnidentifiedImageError
 import torch
@@ -11,13 +11,15 @@ from icrawler.downloader import Downloader
 from transformers import CLIPProcessor, CLIPModel, BlipProcessor, BlipForConditionalGeneration
 
 from scrapping.database import save_image, save_embedding
+from scrapping.embedder import preprocess_on_device
 from common.db.db import get_db
 
 # ---------------------- Config ----------------------
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 SIMILARITY_THRESHOLD = 0.75
+BATCH_SIZE = 16     # images per BLIP/CLIP forward pass
+FETCH_WORKERS = 4   # concurrent downloads; this is the crawl's rate limit
 device = "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu"
 
 # Load models
@@ -26,17 +28,40 @@ clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
 blip_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base").to(device)
 blip_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
 
+# Keep-alive pool shared by the download threads
+_session = requests.Session()
+_session.headers["User-Agent"] = "Mozilla/5.0"
+
 # ---------------------- Helpers ----------------------
-def generate_caption(image: Image.Image) -> str:
-    inputs = blip_processor(images=image, return_tensors="pt").to(device)
+def generate_captions(images: list) -> list:
+    inputs = blip_processor(images=images, return_tensors="pt").to(device)
     out = blip_model.generate(**inputs, max_new_tokens=30)
-    return blip_processor.decode(out[0], skip_special_tokens=True)
+    return blip_processor.batch_decode(out, skip_special_tokens=True)
 
-def generate_embedding(image: Image.Image, text: str):
-    inputs = clip_processor(text=[text], images=image, return_tensors="pt", padding=True).to(device)
+def generate_caption(image: Image.Image) -> str:
+    return generate_captions([image])[0]
+
+def generate_embeddings(images: list, texts: list):
+    inputs = clip_processor.tokenizer(texts, return_tensors="pt", padding=True).to(device)
+    pixel_values = preprocess_on_device(images, clip_processor.image_processor, device, clip_model.dtype)
     with torch.no_grad():
-        outputs = clip_model(**inputs)
-    return outputs.image_embeds[0], outputs.text_embeds[0]
+        outputs = clip_model(**inputs, pixel_values=pixel_values)
+    return outputs.image_embeds, outputs.text_embeds
+
+def generate_embedding(image: Image.Image, text: str):
+    img_embs, txt_embs = generate_embeddings([image], [text])
+    return img_embs[0], txt_embs[0]
+
+def download_image(img_url: str):
+    try:
+        res = _session.get(img_url, timeout=10)
+        res.raise_for_status()
+        return Image.open(BytesIO(res.content)).convert("RGB")
+    except (requests.RequestException, UnidentifiedImageError) as e:
+        logger.error(f"❌ Failed {img_url}: {e}")
+    except Exception as e:
+        logger.error(f"❌ Unexpected error for {img_url}: {e}")
+    return None
 
 def cosine_similarity(a, b):
     a = a / a.norm()
@@ -67,34 +92,38 @@ def fetch_image_urls(keyword: str, max_num: int = 20):
 def process_images(image_urls: list, db, input_emb, input_txt_emb):
     match_found = False
 
-    for img_url in image_urls:
+    # Downloads overlap on a small pool; captioning and embedding run per batch
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        images = list(pool.map(download_image, image_urls))
+    loaded = [(url, image) for url, image in zip(image_urls, images) if image is not None]
+
+    for start in range(0, len(loaded), BATCH_SIZE):
+        batch = loaded[start:start + BATCH_SIZE]
         try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            res = requests.get(img_url, headers=headers, timeout=10)
-            res.raise_for_status()
-            image = Image.open(BytesIO(res.content)).convert("RGB")
-
-            caption = generate_caption(image)
-            img_emb, txt_emb = generate_embedding(image, caption)
-
-            # Save to DB
-            img_entry = save_image(db, img_url, {"page_url": None})
-            if img_entry:
-                save_embedding(db, img_entry.id, img_emb.cpu().numpy(), model_name="clip-vit")
-
-            # Check similarity
-            sim_img = cosine_similarity(input_emb, img_emb)
-            sim_txt = cosine_similarity(input_txt_emb, txt_emb)
-            if sim_img > SIMILARITY_THRESHOLD or sim_txt > SIMILARITY_THRESHOLD:
-                logger.info(f"⚠️ Match found!\nImage URL: {img_url}\nCaption: {caption}\n"
-                            f"Image Sim: {sim_img:.2f}, Caption Sim: {sim_txt:.2f}")
-                match_found = True
-            sleep(1)
-
-        except (requests.RequestException, UnidentifiedImageError) as e:
-            logger.error(f"❌ Failed {img_url}: {e}")
+            batch_images = [image for _, image in batch]
+            captions = generate_captions(batch_images)
+            img_embs, txt_embs = generate_embeddings(batch_images, captions)
         except Exception as e:
-            logger.error(f"❌ Unexpected error for {img_url}: {e}")
+            logger.error(f"❌ Unexpected error for batch of {len(batch)} images: {e}")
+            continue
+
+        for (img_url, _), caption, img_emb, txt_emb in zip(batch, captions, img_embs, txt_embs):
+            try:
+                # Save to DB
+                img_entry = save_image(db, img_url, {"page_url": None})
+                if img_entry:
+                    save_embedding(db, img_entry.id, img_emb.cpu().numpy(), model_name="clip-vit")
+
+                # Check similarity
+                sim_img = cosine_similarity(input_emb, img_emb)
+                sim_txt = cosine_similarity(input_txt_emb, txt_emb)
+                if sim_img > SIMILARITY_THRESHOLD or sim_txt > SIMILARITY_THRESHOLD:
+                    logger.info(f"⚠️ Match found!\nImage URL: {img_url}\nCaption: {caption}\n"
+                                f"Image Sim: {sim_img:.2f}, Caption Sim: {sim_txt:.2f}")
+                    match_found = True
+
+            except Exception as e:
+                logger.error(f"❌ Unexpected error for {img_url}: {e}")
 
     if not match_found:
         logger.info("✅ No match found.")
@@ -105,8 +134,7 @@ def run_pipeline(input_url: str, keyword: str):
 
     # Load input image
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(input_url, headers=headers, timeout=10)
+        res = _session.get(input_url, timeout=10)
         res.raise_for_status()
         input_image = Image.open(BytesIO(res.content)).convert("RGB")
     except (requests.RequestException, UnidentifiedImageError) as e:
@@ -130,5 +158,6 @@ def run_pipeline(input_url: str, keyword: str):
 
 # ---------------------- Main ----------------------
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     sample_url = "https://i.imgur.com/zoros.jpeg"
     run_pipeline(sample_url, keyword="zoro one piece anime")
\ No newline at end of file
@@ -1,15 +1,57 @@
 # scrapping/internal_matching.py
 import logging
+import threading
+import numpy as np
+import orjson
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Union
 from ip_service.models.ip_models import ImageEmbeddings, IpEmbeddings, IpMatches
-from .embedder import cosine_similarity
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 INTERNAL_SIMILARITY_THRESHOLD = 0.2
 
+# Row-normalized IP asset embeddings, reused while (row count, max id) is unchanged
+_ip_matrix_cache = {"key": None, "asset_ids": None, "vectors": None}
+_ip_matrix_lock = threading.Lock()
+
+
+def _ip_asset_matrix(db: Session):
+    """
+    IP embeddings grouped by width: ({dim: asset_ids}, {dim: (N, dim) float32
+    matrix of unit rows}), so similarities against a unit query are one GEMV.
+    """
+    key = tuple(db.execute(select(func.count(), func.max(IpEmbeddings.id))).one())
+    with _ip_matrix_lock:
+        if _ip_matrix_cache["key"] == key:
+            return _ip_matrix_cache["asset_ids"], _ip_matrix_cache["vectors"]
+
+    by_dim = {}
+    for asset_id, vector in db.execute(select(IpEmbeddings.asset_id, IpEmbeddings.vector)):
+        # save_ip_embedding stores json.dumps output, so values may be JSON text
+        if isinstance(vector, str):
+            try:
+                vector = orjson.loads(vector)
+            except orjson.JSONDecodeError:
+                logger.warning("Failed to parse IP embedding for asset %s", asset_id)
+                continue
+        ids, rows = by_dim.setdefault(len(vector), ([], []))
+        ids.append(asset_id)
+        rows.append(vector)
+
+    asset_ids, vectors = {}, {}
+    for dim, (ids, rows) in by_dim.items():
+        matrix = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # Zero vectors score 0, as cosine_similarity did
+        vectors[dim] = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        asset_ids[dim] = np.asarray(ids)
+
+    with _ip_matrix_lock:
+        _ip_matrix_cache.update(key=key, asset_ids=asset_ids, vectors=vectors)
+    return asset_ids, vectors
+
 def find_internal_matches(
     db: Session,
     input_vector: Union[List[float], "torch.Tensor"],
@@ -23,23 +65,31 @@ def find_internal_matches(
 
     matches = []
 
-    # 1️⃣ IP assets
-    ip_assets = db.query(IpEmbeddings).all()
-    for asset in ip_assets:
-        sim = cosine_similarity(input_vector, asset.vector)
-        if sim and sim >= INTERNAL_SIMILARITY_THRESHOLD:
-            matches.append({"type": "ip_asset", "id": asset.asset_id, "similarity_score": sim})
+    # 1️⃣ IP assets: one matrix-vector product against the cached, normalized matrix;
+    # embeddings of another width are skipped, as cosine_similarity did
+    asset_ids, vectors = _ip_asset_matrix(db)
+    query = np.asarray(input_vector, dtype=np.float32)
+    query_norm = np.linalg.norm(query)
+    if len(query) in vectors and query_norm > 0:
+        sims = vectors[len(query)] @ (query / query_norm)
+        hits = np.nonzero(sims >= INTERNAL_SIMILARITY_THRESHOLD)[0]
+        matches.extend(
+            {"type": "ip_asset", "id": int(asset_id), "similarity_score": float(sim)}
+            for asset_id, sim in zip(asset_ids[len(query)][hits], sims[hits])
+        )
 
-    # 2️⃣ System-wide images
-    image_embs_query = db.query(ImageEmbeddings)
+    # 2️⃣ System-wide images: cosine distance computed in Postgres (pgvector);
+    # rows from a CLIP model of another width are skipped, as cosine_similarity does
+    distance = ImageEmbeddings.vector.cosine_distance(input_vector)
+    image_embs_query = db.query(ImageEmbeddings.image_id, distance).filter(
+        func.vector_dims(ImageEmbeddings.vector) == len(input_vector),
+        distance <= 1 - INTERNAL_SIMILARITY_THRESHOLD,
+    )
     if exclude_image_id is not None:
         image_embs_query = image_embs_query.filter(ImageEmbeddings.image_id != exclude_image_id)
-    image_embs = image_embs_query.all()
 
-    for img in image_embs:
-        sim = cosine_similarity(input_vector, img.vector)
-        if sim and sim >= INTERNAL_SIMILARITY_THRESHOLD:
-            matches.append({"type": "image", "id": img.image_id, "similarity_score": sim})
+    for image_id, dist in image_embs_query:
+        matches.append({"type": "image", "id": image_id, "similarity_score": 1 - dist})
 
     logger.info(f"⚡ Found {len(matches)} internal matches above threshold {INTERNAL_SIMILARITY_THRESHOLD}")
     return matches
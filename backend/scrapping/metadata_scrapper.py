@@ -11,7 +11,6 @@ from urllib.parse import urlparse
 import re
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # Request headers to avoid being blocked
 HEADERS = {
@@ -1,16 +1,68 @@
+import asyncio
 import logging
 from io import BytesIO
 from typing import Dict, List, Optional
+import aiohttp
 from scrapping.uploader import upload_to_s3
 from scrapping.scrapper import fetch_images, download_image_content
 from ip_service.services.database import save_image, save_ip_asset, save_ip_match
-from ip_service.services.ip_notification import create_notification
+from ip_service.services.ip_notification import create_notifications_bulk
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from common.config.config import settings
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+_MATCH_FOUND_MSG = "Potential IP match found for image ID {image_id} with similarity {similarity:.2f}".format
+
+# Concurrent match downloads/uploads per pipeline run, to stay polite to remote hosts
+MATCH_FETCH_CONCURRENCY = 16
+
+
+async def _fetch_and_upload_match(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    idx: int,
+    total: int,
+    sim_image: Dict,
+    user_id: int,
+    image_id: int
+) -> Optional[str]:
+    """
+    Download one match and copy it to S3; returns the S3 URL or None on failure.
+    Runs concurrently with the other matches, so it must not touch the DB session.
+    """
+    image_url = sim_image.get("url")
+    if not image_url:
+        logger.warning(f"⚠️ Match {idx} has no URL, skipping")
+        return None
+
+    async with semaphore:
+        logger.info(f"📥 Processing match {idx + 1}/{total}: {image_url}")
+
+        # Download image content
+        content_url = sim_image.get("content") or image_url
+        image_bytes = await download_image_content(content_url, session)
+        
+        if not image_bytes:
+            logger.warning(f"⚠️ Failed to download image {idx}: {content_url}")
+            return None
+
+        # Upload matched image to S3 (boto3 is blocking, keep it off the event loop)
+        try:
+            match_url = await asyncio.to_thread(
+                upload_to_s3,
+                image_bytes,
+                user_id,
+                original_filename=f"match_{image_id}_{idx}.jpg",
+                prefix="uploads/crawled"
+            )
+            logger.info(f"✅ Uploaded match {idx} to S3: {match_url}")
+            return match_url
+        except Exception as match_upload_error:
+            logger.warning(f"⚠️ Failed to upload match {idx} to S3: {match_upload_error}")
+            return None
+
 
 async def run_pipeline(file: BytesIO, user_id: int, filename: str, db: Session) -> Dict:
     """
@@ -37,7 +89,7 @@ async def run_pipeline(file: BytesIO, user_id: int, filename: str, db: Session)
         logger.info(f"📤 Step 1: Uploading original image for user {user_id}")
         
         try:
-            public_url = upload_to_s3(file, user_id, original_filename=filename)
+            public_url = await asyncio.to_thread(upload_to_s3, file, user_id, original_filename=filename)
             logger.info(f"✅ Uploaded to S3: {public_url}")
         except Exception as upload_error:
             logger.exception(f"❌ S3 upload failed for user {user_id}")
@@ -134,39 +186,25 @@ async def run_pipeline(file: BytesIO, user_id: int, filename: str, db: Session)
         logger.info(f"⚙️ Step 4: Processing {len(similar_images)} matches")
         
         matches = []
+        notifications = []
         successful_matches = 0
         failed_matches = 0
         
-        for idx, sim_image in enumerate(similar_images):
+        # Downloads and S3 uploads overlap; DB writes below stay sequential on this session
+        semaphore = asyncio.Semaphore(MATCH_FETCH_CONCURRENCY)
+        async with aiohttp.ClientSession() as session:
+            match_urls = await asyncio.gather(*(
+                _fetch_and_upload_match(session, semaphore, idx, len(similar_images), sim_image, user_id, image_id)
+                for idx, sim_image in enumerate(similar_images)
+            ), return_exceptions=True)
+        
+        for idx, (sim_image, match_url) in enumerate(zip(similar_images, match_urls)):
             try:
-                image_url = sim_image.get("url")
-                if not image_url:
-                    logger.warning(f"⚠️ Match {idx} has no URL, skipping")
+                if isinstance(match_url, Exception):
+                    logger.error(f"❌ Unexpected error fetching match {idx}: {match_url}")
                     failed_matches += 1
                     continue
-
-                logger.info(f"📥 Processing match {idx + 1}/{len(similar_images)}: {image_url}")
-
-                # Download image content
-                content_url = sim_image.get("content") or image_url
-                image_bytes = await download_image_content(content_url)
-                
-                if not image_bytes:
-                    logger.warning(f"⚠️ Failed to download image {idx}: {content_url}")
-                    failed_matches += 1
-                    continue
-
-                # Upload matched image to S3
-                try:
-                    match_url = upload_to_s3(
-                        image_bytes,
-                        user_id,
-                        original_filename=f"match_{image_id}_{idx}.jpg",
-                        prefix="uploads/crawled"
-                    )
-                    logger.info(f"✅ Uploaded match {idx} to S3: {match_url}")
-                except Exception as match_upload_error:
-                    logger.warning(f"⚠️ Failed to upload match {idx} to S3: {match_upload_error}")
+                if match_url is None:
                     failed_matches += 1
                     continue
 
@@ -215,16 +253,11 @@ async def run_pipeline(file: BytesIO, user_id: int, filename: str, db: Session)
                     failed_matches += 1
                     continue
 
-                # Create notification
-                try:
-                    create_notification(
-                        db,
-                        user_id,
-                        f"Potential IP match found for image ID {image_id} with similarity {similarity_score:.2f}"
-                    )
-                except Exception as notif_error:
-                    logger.warning(f"⚠️ Failed to create notification for match {idx}: {notif_error}")
-                    # Don't fail the match if notification fails
+                # Queue notification; all of them are written together after the loop
+                notifications.append({
+                    "match_id": match_id,
+                    "message": _MATCH_FOUND_MSG(image_id=image_id, similarity=similarity_score)
+                })
 
                 # Add to results
                 matches.append({
@@ -244,7 +277,15 @@ async def run_pipeline(file: BytesIO, user_id: int, filename: str, db: Session)
                 failed_matches += 1
                 continue
 
-        # ========== Step 5: Return Results ==========
+        # ========== Step 5: Create Notifications ==========
+        try:
+            create_notifications_bulk(db, user_id, notifications)
+        except Exception as notif_error:
+            db.rollback()
+            logger.warning(f"⚠️ Failed to create {len(notifications)} notifications: {notif_error}")
+            # Don't fail the pipeline if notifications fail
+
+        # ========== Step 6: Return Results ==========
         logger.info(
             f"✅ Pipeline completed: {successful_matches} successful matches, "
             f"{failed_matches} failed matches"
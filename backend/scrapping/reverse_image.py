@@ -14,7 +14,6 @@ from common.db.db import get_db
 from common.config.config import settings
 
 # ---------------------- Configuration ----------------------
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 SERP_API_KEY = settings.SERP_API_KEY
@@ -165,6 +164,7 @@ def run_pipeline(public_image_urls: list):
 
 # ---------------------- Main ----------------------
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Pass publicly accessible image URLs
     sample_urls = [
         "https://i.imgur.com/zoros.jpeg"
@@ -12,7 +12,6 @@ from fastapi import HTTPException
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 async def fetch_images(img_url: str, sources: List[str], serpapi_key: str) -> List[Dict]:
@@ -318,34 +317,39 @@ def _process_page_result(page: Dict, idx: int, best_guess: str, full_response: D
         return None
 
 
-async def download_image_content(image_url: str) -> Optional[bytes]:
+async def download_image_content(image_url: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[bytes]:
     """
     Download image content from a URL.
     
     Args:
         image_url: URL of the image to download
+        session: Optional shared session, so a batch of downloads reuses its
+            connection pool; a throwaway session is opened when omitted
         
     Returns:
         Image bytes or None if download fails
     """
     try:
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                return await download_image_content(image_url, own_session)
+        
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                image_url, 
-                headers=headers, 
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    logger.info(f"✅ Downloaded image: {image_url} ({len(content)} bytes)")
-                    return content
-                else:
-                    logger.warning(f"⚠️ Failed to download image {image_url}: status {response.status}")
-                    return None
+        async with session.get(
+            image_url, 
+            headers=headers, 
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as response:
+            if response.status == 200:
+                content = await response.read()
+                logger.info(f"✅ Downloaded image: {image_url} ({len(content)} bytes)")
+                return content
+            else:
+                logger.warning(f"⚠️ Failed to download image {image_url}: status {response.status}")
+                return None
                     
     except Exception as e:
         logger.warning(f"⚠️ Error downloading image {image_url}: {e}")
@@ -16,13 +16,12 @@ import uuid
 import os
 import imghdr
 from mimetypes import guess_extension, guess_type
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 from io import BytesIO
 from pathlib import Path
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # Configuration - adjust if needed
 AWS_BUCKET = "sentinelai980"
@@ -242,4 +241,42 @@ def upload_to_s3(
         return generate_presigned_url(s3_key, expiration=presigned_expiration)
 
     # otherwise return the s3 key
-    return s3_key
\ No newline at end of file
+    return s3_key
+
+
+def upload_pdf_to_s3(
+    file_obj: BinaryIO,
+    user_id: int,
+    filename: str,
+    prefix: str = "dmca/reports",
+    make_presigned: bool = True,
+    presigned_expiration: int = PRESIGNED_URL_EXPIRATION
+) -> str:
+    """
+    Stream a PDF from a binary file-like object to S3 (private) and return a presigned URL (by default).
+    - file_obj: readable binary file-like object positioned at the start (e.g. BytesIO).
+      Sent with upload_fileobj, so nothing is written to local disk.
+    - user_id: integer user id used in key path.
+    - filename: object name under the prefix, e.g. 'dmca_report_12.pdf'.
+    - prefix: subfolder (default 'dmca/reports').
+    - make_presigned: if True (default) return presigned URL; otherwise return object key.
+    - presigned_expiration: TTL for presigned URL in seconds.
+    """
+    s3_key = f"users/{user_id}/{prefix.strip('/')}/{filename}"
+
+    try:
+        s3_client.upload_fileobj(
+            file_obj,
+            AWS_BUCKET,
+            s3_key,
+            ExtraArgs={"ContentType": "application/pdf"}
+        )
+        logger.info("✅ Uploaded PDF to S3: %s", s3_key)
+    except ClientError as e:
+        logger.exception("❌ S3 PDF upload failed for %s: %s", s3_key, e)
+        raise RuntimeError(f"S3 upload failed: {e}") from e
+
+    if make_presigned:
+        return generate_presigned_url(s3_key, expiration=presigned_expiration)
+
+    return s3_key
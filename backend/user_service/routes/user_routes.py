@@ -43,7 +43,6 @@ AWS_REGION = "us-east-1"
 PROFILE_PICTURE_EXPIRATION = 604800  # 7 days for profile pictures
 s3_client = boto3.client("s3", region_name=AWS_REGION)
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 